@@ -2,13 +2,26 @@
 # Single-file Streamlit app: Internship Recommendation + beautiful CSS cards
 # Run: pip install streamlit pandas scikit-learn && streamlit run streamlit_internship_recommender.py
 
+import time
+script_started = time.perf_counter()   # the startup profile counts the imports below
+
+import sys
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import streamlit.components.v1 as components
 
+# the recommender engine package lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# the package loads its modules on first use: the catalog engine (pandas, scipy) only after the first paint
+import recommender
+
 st.set_page_config(page_title="Internship Recommender", layout="wide")
+cold_start = recommender.claim_startup('namira')
+trace = recommender.start_trace('namira', enabled=cold_start, start=script_started)
+trace.lap('imports')
+
+PAGE_SIZE = 12    # cards rendered per results page
 
 # ---------- Custom CSS (beautiful card layout) ----------
 css = """
@@ -54,12 +67,15 @@ with st.sidebar.form('profile'):
     name = st.text_input('Name')
     skills_text = st.text_area('Enter skills (comma separated) or paste resume text', placeholder='e.g. Python, Machine Learning, SQL, pandas, communication')
     location_pref = st.selectbox('Location preference', ['Any', 'Remote', 'On-site', 'Hybrid'])
-    domain_pref = st.multiselect('Interested domains', ['Data Science','Web Dev','Marketing','Design','Finance','Research'], default=['Data Science'])
+    domain_pref = st.multiselect('Interested domains', recommender.DOMAINS, default=['Data Science'])
     min_stipend = st.slider('Minimum stipend (₹)', 0, 50000, 0, step=500)
     submitted = st.form_submit_button('Update profile')
 
 if not skills_text:
     st.info('Tip: paste your resume text or list of skills in the sidebar to get personalized recommendations.')
+trace.lap('first_paint')
+first_paint_ms = (time.perf_counter() - script_started) * 1000
+first_paint_modules = recommender.heavy_modules()
 
 # ---------- Sample internship data (you can replace with CSV/upload) ----------
 sample_data = [
@@ -75,62 +91,83 @@ sample_data = [
       'description':'Create educational cartoons for children, scriptwriting, basic animation tools, creativity.'}
 ]
 
-df = pd.DataFrame(sample_data)
+# ---------- Search index (hashed TF-IDF from the recommender engine, persisted per content hash) ----------
+@st.cache_resource
+def sample_catalog():
+    # one read-only catalog per process; sessions fork it and only pay for their own changes
+    return recommender.IncrementalCatalog.from_listings(sample_data).freeze()
+
+def reset_catalog():
+    st.session_state.catalog = sample_catalog().fork()
+    st.session_state.upload_id = None
+
+if 'catalog' not in st.session_state:
+    reset_catalog()
 
 # Allow user to upload their own CSV of internships
 st.markdown('---')
 col_upload, col_hint = st.columns([1,3])
 with col_upload:
     uploaded = st.file_uploader('Upload internships CSV (optional)', type=['csv'])
+    append_mode = st.checkbox('Add to current listings', help='Append the upload to the listings already loaded instead of replacing them.')
 with col_hint:
     st.markdown('If you have a CSV with columns: company, role, location, stipend, description — upload it to replace the sample listings.')
 
+if uploaded is None and st.session_state.catalog.name != 'sample':
+    reset_catalog()
 if uploaded:
-    try:
-        user_df = pd.read_csv(uploaded)
-        # basic safety: require description column
-        if 'description' in user_df.columns:
-            df = user_df
-            st.success('Uploaded internships loaded')
-        else:
-            st.error('CSV must include a `description` column. Using sample data.')
-    except Exception as e:
-        st.error('Could not parse uploaded CSV — using sample data.')
-
-# ---------- Simple recommender (TF-IDF + cosine similarity) ----------
-@st.cache_data
-def build_matrix(descriptions):
-    vec = TfidfVectorizer(stop_words='english', max_features=1000)
-    mat = vec.fit_transform(descriptions)
-    return vec, mat
-
-vec, mat = build_matrix(df['description'].astype(str).tolist())
-
+    # ingest each upload once per session; reruns reuse the parsed catalog and index
+    if st.session_state.upload_id != uploaded.file_id:
+        st.session_state.upload_id = uploaded.file_id
+        progress = st.progress(0.0, text='Reading uploaded CSV…')
+        try:
+            # the same file uploaded again (by anyone on this host) maps the stored index
+            user_catalog, rejected = recommender.IncrementalCatalog.from_csv(
+                uploaded, uploaded.file_id, lambda fraction, loaded, rejected: progress.progress(
+                    fraction, text=f'Loaded {loaded:,} listings, rejected {rejected:,} rows'))
+            skipped = f', {rejected:,} malformed rows skipped' if rejected else ''
+            if append_mode:
+                st.session_state.catalog.append(user_catalog)
+                st.session_state.upload_status = ('success', f'Added {len(user_catalog.frame):,} listings{skipped}')
+            else:
+                st.session_state.catalog = user_catalog
+                st.session_state.upload_status = ('success', f'Uploaded internships loaded: {len(user_catalog.frame):,} listings{skipped}')
+            st.session_state.catalog.name = uploaded.file_id
+        except ValueError as e:
+            st.session_state.upload_status = ('error', f'{e}. Using current listings.')
+        except Exception:
+            st.session_state.upload_status = ('error', 'Could not parse uploaded CSV — using current listings.')
+        progress.empty()
+    status, message = st.session_state.upload_status
+    (st.success if status == 'success' else st.error)(message)
+
+catalog = st.session_state.catalog
+with st.expander('Index maintenance'):
+    st.markdown(f"{catalog.live:,} live listings · {catalog.index.delta_rows:,} added since last compaction · "
+                f"{catalog.tombstoned:,} tombstoned")
+    if st.button('Compact and reweight index', key='compact_index'):
+        st.success(f'Index compacted: {catalog.compact():,} listings reweighted')
+
+# ---------- Simple recommender (TF-IDF + inverted index) ----------
 # Build user vector
 user_profile = skills_text if skills_text else ''
-user_vec = vec.transform([user_profile]) if user_profile.strip() else None
-
-# compute similarity
-if user_vec is not None and user_profile.strip():
-    sim = cosine_similarity(user_vec, mat).flatten()
-    df['score'] = sim
-else:
-    df['score'] = 0.0
-
-# Apply filters
-filtered = df.copy()
-if location_pref and location_pref != 'Any':
-    filtered = filtered[filtered['location'].str.contains(location_pref, case=False, na=False)]
-if min_stipend:
-    filtered = filtered[filtered['stipend'] >= min_stipend]
-if domain_pref:
-    domain_mask = filtered['description'].apply(lambda s: any(d.lower() in s.lower() for d in domain_pref))
-    # keep ones that match at least one domain OR keep all if none matched
-    if domain_mask.any():
-        filtered = filtered[domain_mask]
 
-# sort by score
-filtered = filtered.sort_values('score', ascending=False)
+# Rank once per (catalog, profile, filters); paging reuses the stored ranking
+ranking_key = (catalog.version, user_profile.strip(), location_pref, min_stipend, tuple(domain_pref))
+if st.session_state.get('ranking_key') != ranking_key:
+    # filters are a row mask; domains keep ones that match at least one OR all if none matched
+    mask = catalog.mask(location_pref, min_stipend, domain_pref)
+    st.session_state.ranking = catalog.recommend(user_profile, mask)
+    st.session_state.ranking_key = ranking_key
+    st.session_state.page = 0
+
+rows, scores, explanations = st.session_state.ranking
+page_count = max(1, -(-len(rows) // PAGE_SIZE))
+page = min(st.session_state.page, page_count - 1)
+page_slice = slice(page * PAGE_SIZE, (page + 1) * PAGE_SIZE)
+page_df = catalog.listings(rows[page_slice])
+page_scores = scores[page_slice]
+page_explanations = explanations[page_slice]
 
 # ---------- Display results in beautiful cards ----------
 st.markdown('<div style="margin-top:10px"></div>', unsafe_allow_html=True)
@@ -150,35 +187,33 @@ results_html = """
     <div class='card-grid'>
 """.format(name=name or '—', skills=skills_text or '—', loc=location_pref, doms=','.join(domain_pref) if domain_pref else 'Any')
 
-# construct cards
-cards = ''
-for _, row in filtered.iterrows():
-    tags = ''
-    # extract simple tags from description (first 5 words that look like tech)
-    for t in row['description'].split(',')[:5]:
-        tags += f"<div class='tag'>{t.strip()}</div>"
-    explain = ''
-    if user_profile.strip():
-        explain = f"Matches your skills: top keywords overlap (score {row['score']:.2f})"
-    else:
-        explain = 'Set your skills to get personalized scores.'
-    card = f"""
-    <div class='card'>
-      <div class='row'>
-        <div>
-          <div class='company'>{row['company']}</div>
-          <div class='role'>{row['role']}</div>
-        </div>
-        <div style='text-align:right'>
-          <div class='relevance'>{row['stipend'] and '₹'+str(row['stipend'])}</div>
-          <div style='font-size:12px;color:var(--muted)'>{row['location']}</div>
-        </div>
-      </div>
-      <div class='tags'>{tags}</div>
-      <div class='explain'>{explain}</div>
-    </div>
-    """
-    cards += card
+# construct the page's cards in one pass over plain column lists
+card_html = (
+    "<div class='card'><div class='row'>"
+    "<div><div class='company'>{company}</div><div class='role'>{role}</div></div>"
+    "<div style='text-align:right'><div class='relevance'>{stipend}</div>"
+    "<div style='font-size:12px;color:var(--muted)'>{location}</div></div>"
+    "</div><div class='tags'>{tags}</div><div class='explain'>{explain}</div></div>"
+)
+def explain_text(terms, score):
+    if not user_profile.strip():
+        return 'Set your skills to get personalized scores.'
+    matched = ', '.join(f"{term} ({share:.0%})" for term, share in terms)
+    return f"Matches your skills: {matched} · score {score:.2f}"
+
+cards = ''.join(
+    card_html.format(
+        company=company, role=role, stipend=stipend and '₹'+str(stipend), location=location,
+        # tags are the skill terms that contributed most to the score; without skills, description fragments
+        tags=''.join(f"<div class='tag'>{t}</div>" for t in ([term for term, _ in terms] if terms
+                                                            else [t.strip() for t in description.split(',')[:5]])),
+        explain=explain_text(terms, score),
+    )
+    for company, role, stipend, location, description, score, terms in zip(
+        page_df['company'].tolist(), page_df['role'].tolist(), page_df['stipend'].tolist(),
+        page_df['location'].tolist(), page_df['description'].astype(str).tolist(), page_scores.tolist(),
+        page_explanations)
+)
 
 if cards.strip() == '':
     cards = "<div class='card'><div class='company'>No matches found</div><div class='explain'>Try changing filters or enter your skills to get recommendations.</div></div>"
@@ -187,74 +222,23 @@ results_html += cards + "</div></div></div>"
 
 components.html(results_html, height=600)
 
-st.markdown("""
-<div class='footer'>Made with ❤️ — pick, filter, and click to apply. Want advanced matching with embeddings, resume parsing, or a database backend? Tell me which feature next and I will add it.</div>
-""", unsafe_allow_html=True)
-import streamlit as st
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import linear_kernel
-
-# ---- Custom CSS for styling ----
-st.markdown("""
-<style>
-    .main-title {
-        font-size: 36px;
-        text-align: center;
-        color: #2E86C1;
-        font-weight: bold;
-    }
-    .card {
-        background-color: #f9f9f9;
-        padding: 20px;
-        border-radius: 12px;
-        box-shadow: 2px 2px 10px rgba(0,0,0,0.1);
-        margin-bottom: 20px;
-    }
-    .internship-title {
-        font-size: 22px;
-        font-weight: bold;
-        color: #1B4F72;
-    }
-    .internship-details {
-        font-size: 16px;
-        color: #333;
-    }
-</style>
-""", unsafe_allow_html=True)
+def change_page(step):
+    st.session_state.page += step
 
-# ---- Title ----
-st.markdown('<p class="main-title">🎓 Internship Recommendation System</p>', unsafe_allow_html=True)
+if page_count > 1:
+    prev_col, status_col, next_col = st.columns([1, 2, 1])
+    prev_col.button('◀ Previous', key='previous_page', on_click=change_page, args=(-1,), disabled=page == 0)
+    status_col.markdown(f"<div style='text-align:center'>Page {page + 1} of {page_count}</div>", unsafe_allow_html=True)
+    next_col.button('Next ▶', key='next_page', on_click=change_page, args=(1,), disabled=page >= page_count - 1)
 
-# ---- User Input ----
-st.sidebar.header("Your Profile")
-skills = st.sidebar.text_area("Enter your skills (comma separated):", "Python, Data Analysis, Machine Learning")
-location = st.sidebar.text_input("Preferred Location:", "Remote")
-domain = st.sidebar.text_input("Preferred Domain:", "Data Science")
+trace.lap('results')
 
-# ---- Sample Internship Data ----
-data = {
-    "Title": ["Data Science Intern", "Web Development Intern", "Marketing Intern"],
-    "Skills": ["Python, Machine Learning, Data Analysis", "HTML, CSS, JavaScript", "SEO, Social Media, Communication"],
-    "Location": ["Remote", "Mumbai", "Delhi"],
-    "Stipend": ["₹10,000", "₹5,000", "₹3,000"]
-}
-df = pd.DataFrame(data)
-
-# ---- Recommendation Logic ----
-tfidf = TfidfVectorizer(stop_words='english')
-tfidf_matrix = tfidf.fit_transform(df["Skills"])
-cosine_sim = linear_kernel(tfidf_matrix, tfidf.transform([skills]))
-df["Score"] = cosine_sim.flatten()
-recommendations = df.sort_values(by="Score", ascending=False)
-
-# ---- Display Results ----
-st.subheader("🔎 Recommended Internships")
-for _, row in recommendations.iterrows():
-    st.markdown(f"""
-    <div class="card">
-        <div class="internship-title">{row['Title']}</div>
-        <div class="internship-details">📍 {row['Location']} | 💰 {row['Stipend']}</div>
-        <div class="internship-details"><b>Required Skills:</b> {row['Skills']}</div>
-    </div>
-    """, unsafe_allow_html=True)
+st.markdown("""
+<div class='footer'>Made with ❤️ — pick, filter, and click to apply. Want advanced matching with embeddings, resume parsing, or a database backend? Tell me which feature next and I will add it.</div>
+""", unsafe_allow_html=True)
+if cold_start:
+    startup = recommender.record_startup('namira', trace, first_paint_ms=first_paint_ms,
+                                         first_paint_modules=first_paint_modules)
+    print(f"namira startup: imports {startup['spans'][0]['ms']:.0f} ms, first paint {first_paint_ms:.0f} ms, "
+          f"first run {startup['total_ms']:.0f} ms; loaded {', '.join(first_paint_modules) or 'no heavy modules'} "
+          f"at first paint, {', '.join(startup['heavy_modules']) or 'none'} by the end", file=sys.stderr)
@@ -0,0 +1,76 @@
+"""Headless internship recommendation engine.
+
+Catalog loading, filtering, scoring and top-K selection as a plain Python API, with no
+Streamlit dependency. Both Streamlit apps are thin clients of it; batch jobs and services
+can use it directly:
+
+    from recommender import Recommender
+    engine = Recommender.builtin()
+    rows, scores = engine.recommend('python, sql', work_mode='Online', min_stipend=15000)
+    engine.catalog.iloc[rows]
+
+Importing the package is cheap: submodules, and pandas / scikit-learn behind them, are only
+imported when one of their names is first used.
+"""
+import importlib
+
+_EXPORTS = {
+    'Recommender': 'engine',
+    'BUILTIN_LISTINGS': 'catalog',
+    'load_catalog': 'catalog',
+    'parse_catalog': 'catalog',
+    'build_filter_index': 'catalog',
+    'TfidfIndex': 'tfidf',
+    'LsaIndex': 'lsa',
+    'SqliteRecommender': 'sqlcatalog',
+    'ShardedSearch': 'sharded',
+    'NeighbourGraph': 'neighbours',
+    'IncrementalIndex': 'incremental',
+    'IncrementalCatalog': 'incremental_catalog',
+    'count_terms': 'incremental',
+    'save_indexed_catalog': 'incremental',
+    'load_indexed_catalog': 'incremental',
+    'ingest_csv': 'ingest',
+    'catalog_key': 'ingest',
+    'DOMAINS': 'domains',
+    'tag_domains': 'domains',
+    'has_domain': 'domains',
+    'top_k': 'ranking',
+    'score_postings': 'ranking',
+    'search_postings': 'ranking',
+    'ResultCache': 'cache',
+    'FragmentCache': 'cache',
+    'extract_resume_text': 'resume',
+    'build_skill_matcher': 'resume',
+    'resume_skill_profile': 'resume',
+    'card_bodies': 'cards',
+    'card_grid': 'cards',
+    'generate_listings': 'synthetic',
+    'StageMemo': 'memo',
+    'NO_MEMO': 'memo',
+    'start_trace': 'tracing',
+    'NO_TRACE': 'tracing',
+    'claim_startup': 'tracing',
+    'heavy_modules': 'tracing',
+    'record_startup': 'tracing',
+    'startup_record': 'tracing',
+    'write_record': 'tracing',
+    'TEXT_STRINGS': 'ui',
+    'LANGUAGE_OPTIONS': 'ui',
+    'APP_CSS': 'ui',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,195 @@
+"""Batch recommendations: JSONL student profiles in, JSONL top-K listings out.
+
+    python -m recommender.batch profiles.jsonl -o results.jsonl --workers 0
+
+Each input line is a profile such as
+    {"id": "s-001", "query": "python, sql", "work_mode": "Online", "location": null, "min_stipend": 15000}
+where `query` may also be given as a `skills` list and every filter is optional. Profiles are
+read in blocks; each block is vectorized at once and scored against the whole catalog as one
+sparse matrix product, then every profile's filter mask and top-K are applied to its row.
+Blocks can be spread over a process pool; output order always follows input order.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from .engine import MIN_SCORE, TOP_K, Recommender
+from .ranking import select_candidates, top_k
+
+BLOCK_SIZE = 1024   # profiles vectorized and scored per sparse product
+
+
+def normalize_profile(raw, default_id):
+    """Profile dict with every field filled in from a decoded JSON object; raises ValueError if invalid."""
+    if not isinstance(raw, dict):
+        raise ValueError("expected a JSON object")
+    query = raw.get('query', raw.get('skills', ''))
+    if isinstance(query, list):
+        query = ", ".join(str(skill) for skill in query)
+    try:
+        min_stipend = int(raw.get('min_stipend') or 0)
+    except (TypeError, ValueError):
+        raise ValueError("min_stipend must be a number") from None
+    return {
+        'id': raw.get('id', default_id),
+        'query': str(query or '').strip(),
+        'work_mode': raw.get('work_mode') or 'Any',
+        'location': raw.get('location') or None,
+        'min_stipend': min_stipend,
+    }
+
+
+def parse_profile(line_number, line):
+    """Profile dict from one JSONL line; raises ValueError for malformed input."""
+    try:
+        raw = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"line {line_number}: invalid JSON ({e})") from None
+    try:
+        return normalize_profile(raw, line_number)
+    except ValueError as e:
+        raise ValueError(f"line {line_number}: {e}") from None
+
+
+def recommend_block(engine, profiles, k=TOP_K, min_score=MIN_SCORE):
+    """One output record per profile (or per error entry, passed through) for a block of profiles."""
+    masks = {}
+
+    def mask_for(profile):
+        filters = (profile['work_mode'], profile['location'], profile['min_stipend'])
+        if filters not in masks:
+            masks[filters] = engine.mask(*filters)
+        return masks[filters]
+
+    queried = [slot for slot, profile in enumerate(profiles) if 'error' not in profile and profile['query']]
+    block_scores = engine.index.score_block([profiles[slot]['query'] for slot in queried]) if queried else None
+    score_rows = {slot: position for position, slot in enumerate(queried)}
+
+    records, ranked = [], []
+    for slot, profile in enumerate(profiles):
+        if 'error' in profile:
+            records.append(profile)
+            continue
+        try:
+            mask = mask_for(profile)
+        except ValueError as e:
+            records.append({'id': profile['id'], 'error': str(e)})
+            continue
+        if slot not in score_rows:
+            filtered_rows = np.flatnonzero(mask)
+            rows, scores = filtered_rows[top_k(engine.stipends[filtered_rows], k)], None
+        else:
+            start, end = block_scores.indptr[score_rows[slot]], block_scores.indptr[score_rows[slot] + 1]
+            rows, scores = select_candidates(block_scores.indices[start:end], block_scores.data[start:end], mask, k, min_score)
+        records.append({'id': profile['id']})
+        ranked.append((records[-1], rows, scores))
+
+    # company and role of only the listings returned, read from the catalog in one gather for the whole block
+    selected = np.concatenate([rows for _, rows, _ in ranked]) if ranked else np.empty(0, dtype=np.int64)
+    names = engine.catalog.iloc[selected, engine.catalog.columns.get_indexer(['company', 'role'])]
+    companies, roles = names['company'].tolist(), names['role'].tolist()
+    offset = 0
+    for record, rows, scores in ranked:
+        end = offset + len(rows)
+        scores = [None] * len(rows) if scores is None else scores.tolist()
+        record['results'] = [
+            {'row': row, 'company': company, 'role': role, 'score': score}
+            for row, company, role, score in zip(rows.tolist(), companies[offset:end], roles[offset:end], scores)]
+        offset = end
+    return records
+
+
+_worker_engine = None
+
+
+def _init_worker():
+    global _worker_engine
+    # each worker maps the stored catalog and index instead of receiving a pickled copy
+    _worker_engine = Recommender.builtin()
+
+
+def _recommend_in_worker(profiles, k, min_score):
+    return recommend_block(_worker_engine, profiles, k, min_score)
+
+
+def read_blocks(lines, block_size):
+    """Blocks of parsed profiles; a malformed line becomes an {'id', 'error'} entry in place."""
+    numbered = enumerate(lines, start=1)
+    while True:
+        block = []
+        for line_number, line in islice(numbered, block_size):
+            if not line.strip():
+                continue
+            try:
+                block.append(parse_profile(line_number, line))
+            except ValueError as e:
+                block.append({'id': line_number, 'error': str(e)})
+        if not block:
+            return
+        yield block
+
+
+def run(lines, out, k=TOP_K, min_score=MIN_SCORE, block_size=BLOCK_SIZE, workers=1):
+    """Writes one JSON line per profile to `out`; returns (profiles, errors)."""
+    written = errors = 0
+
+    def write(records):
+        nonlocal written, errors
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            errors += 'error' in record
+        written += len(records)
+
+    blocks = read_blocks(lines, block_size)
+    if workers <= 1:
+        engine = Recommender.builtin()
+        for block in blocks:
+            write(recommend_block(engine, block, k, min_score))
+        return written, errors
+
+    # A bounded window of in-flight blocks keeps memory flat on very large inputs
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for block in blocks:
+            pending.append(pool.submit(_recommend_in_worker, block, k, min_score))
+            if len(pending) >= 2 * workers:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+    return written, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m recommender.batch', description=__doc__.split('\n\n')[0])
+    parser.add_argument('profiles', help="JSONL file of student profiles, or '-' for stdin")
+    parser.add_argument('-o', '--output', default='-', help="JSONL file to write, or '-' for stdout (default)")
+    parser.add_argument('-k', '--top-k', type=int, default=TOP_K, help=f"listings per profile (default {TOP_K})")
+    parser.add_argument('--min-score', type=float, default=MIN_SCORE, help=f"score listings must exceed (default {MIN_SCORE})")
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help=f"profiles per sparse product (default {BLOCK_SIZE})")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes; 0 uses every core (default 1)")
+    args = parser.parse_args(argv)
+    if args.top_k < 1 or args.block_size < 1 or args.workers < 0:
+        parser.error('--top-k and --block-size must be positive and --workers non-negative')
+    workers = args.workers or os.cpu_count() or 1
+
+    source = sys.stdin if args.profiles == '-' else open(args.profiles, encoding='utf-8')
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        written, errors = run(source, out, args.top_k, args.min_score, args.block_size, workers)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"{written:,} profiles written, {errors:,} rejected", file=sys.stderr)
+    return 1 if errors and errors == written else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""Pipeline benchmarks over synthetic catalogs from 1k to 1M listings.
+
+    python -m recommender.bench --sizes 1000 10000 100000 1000000 -o bench.json
+    python -m recommender.bench --sizes 1000 10000 --compare bench.json
+
+Each size runs in a fresh process with an empty temporary index store, so cold and warm
+timings and peak RSS belong to that size alone. Stages:
+
+    generate            synthetic listings (recommender.synthetic)
+    load_catalog_cold   typed catalog parsed from the raw listings and written to the store
+    load_catalog_warm   the same catalog memory-mapped from the store
+    filter_index        per-city / per-work-mode masks (Recommender construction)
+    index_build_cold    TF-IDF fit, transform and store write
+    index_load_warm     TF-IDF index memory-mapped from the store
+    filter_mask         one filter combination -> row mask (latency percentiles)
+    query               one skill query over a filtered catalog, result cache bypassed (percentiles)
+    batch_block         a block of profiles scored in one sparse product (recommender.batch)
+    render_page         one page of result cards rendered without the fragment cache (percentiles)
+
+The report is JSON; --compare flags stages that got slower than a previous report by more
+than --tolerance and exits non-zero, so it can gate a change.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+QUERIES = 200          # latency samples per percentile stage
+WARMUP = 5             # samples run before timing starts
+BATCH_PROFILES = 1024
+PAGE_SIZE = 10
+TOLERANCE = 0.2
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def latency(samples):
+    ms = np.asarray(samples) * 1000
+    return {'runs': len(ms), 'p50_ms': float(np.percentile(ms, 50)), 'p99_ms': float(np.percentile(ms, 99)),
+            'mean_ms': float(ms.mean())}
+
+
+def run_size(n, queries=QUERIES, seed=0):
+    """Benchmark record for one catalog size; call in a fresh process with an empty store."""
+    from .batch import recommend_block
+    from .cards import card_bodies, card_grid
+    from .catalog import load_catalog
+    from .engine import MIN_SCORE, TOP_K, WORK_MODES, Recommender
+    from .synthetic import generate_listings, sample_queries
+    from .tfidf import TfidfIndex
+
+    stages = {}
+
+    def timed(name, build):
+        start = time.perf_counter()
+        result = build()
+        stages[name] = {'seconds': time.perf_counter() - start, 'peak_rss_mb': peak_rss_mb()}
+        return result
+
+    def sampled(name, calls):
+        samples = []
+        for position, call in enumerate(calls):
+            start = time.perf_counter()
+            call()
+            if position >= WARMUP:
+                samples.append(time.perf_counter() - start)
+        stages[name] = {**latency(samples), 'peak_rss_mb': peak_rss_mb()}
+
+    listings = timed('generate', lambda: generate_listings(n, seed))
+    timed('load_catalog_cold', lambda: load_catalog(listings))
+    catalog = timed('load_catalog_warm', lambda: load_catalog(listings))
+    del listings
+    engine = timed('filter_index', lambda: Recommender(catalog))
+    index = timed('index_build_cold', lambda: TfidfIndex.build(catalog))
+    timed('index_load_warm', lambda: TfidfIndex.build(catalog))
+
+    rng = np.random.default_rng(seed)
+    cities = [None] + engine.cities
+    filters = [(WORK_MODES[rng.integers(len(WORK_MODES))], cities[rng.integers(len(cities))] if rng.random() < 0.3 else None,
+                int(rng.choice([0, 0, 10000, 20000]))) for _ in range(WARMUP + queries)]
+    texts = sample_queries(WARMUP + queries, seed)
+    sampled('filter_mask', [lambda f=f: engine.mask(*f) for f in filters])
+
+    masks = [engine.mask(*f) for f in filters]
+    results = []
+    sampled('query', [lambda text=text, mask=mask: results.append(index.search(text, mask, TOP_K, MIN_SCORE))
+                      for text, mask in zip(texts, masks)])
+
+    profiles = [{'id': i, 'query': texts[i % len(texts)], 'work_mode': f[0], 'location': f[1], 'min_stipend': f[2]}
+                for i, f in zip(range(BATCH_PROFILES), filters * (BATCH_PROFILES // len(filters) + 1))]
+    engine.index  # mapped from the store before timing, as a serving process would have it
+    timed('batch_block', lambda: recommend_block(engine, profiles, TOP_K, MIN_SCORE))
+    stages['batch_block']['profiles'] = len(profiles)
+
+    sampled('render_page', [lambda rows=rows, scores=scores: card_grid(card_bodies(catalog, rows[:PAGE_SIZE], 'Stipend'),
+                                                                      scores[:PAGE_SIZE])
+                            for rows, scores in results])
+    return {'size': n, 'stages': stages, 'peak_rss_mb': peak_rss_mb()}
+
+
+def environment():
+    import pandas
+    import scipy
+    import sklearn
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'commit': commit, 'python': platform.python_version(),
+            'platform': platform.platform(), 'cpus': os.cpu_count(), 'numpy': np.__version__,
+            'pandas': pandas.__version__, 'scipy': scipy.__version__, 'scikit-learn': sklearn.__version__}
+
+
+def run_isolated(n, queries, seed):
+    """Runs one size in a child process with its own temporary index store."""
+    with tempfile.TemporaryDirectory(prefix='internmate-bench-') as store_dir:
+        completed = subprocess.run(
+            [sys.executable, '-m', 'recommender.bench', '--single', str(n), '--queries', str(queries), '--seed', str(seed)],
+            cwd=Path(__file__).resolve().parent.parent, env={**os.environ, 'INTERNMATE_INDEX_DIR': store_dir},
+            capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"benchmark for {n:,} listings failed:\n{completed.stderr}")
+    return json.loads(completed.stdout)
+
+
+def headline(stage):
+    return f"{stage['p50_ms']:.2f}/{stage['p99_ms']:.2f} ms" if 'p50_ms' in stage else f"{stage['seconds']:.3f} s"
+
+
+def compare(report, baseline, tolerance):
+    """Lines describing each stage against the baseline, and whether any regressed."""
+    old_runs = {run['size']: run for run in baseline['runs']}
+    lines, regressed = [], False
+    for run in report['runs']:
+        old = old_runs.get(run['size'])
+        if old is None:
+            continue
+        for name, stage in run['stages'].items():
+            old_stage = old['stages'].get(name)
+            if old_stage is None:
+                continue
+            metric = 'p99_ms' if 'p99_ms' in stage else 'seconds'
+            ratio = stage[metric] / old_stage[metric] if old_stage[metric] else float('inf')
+            flag = ratio > 1 + tolerance
+            regressed |= flag
+            lines.append(f"{run['size']:>9,} {name:<18} {metric:<8} x{ratio:5.2f}{'  REGRESSION' if flag else ''}")
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m recommender.bench', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="catalog sizes to benchmark")
+    parser.add_argument('--queries', type=int, default=QUERIES, help=f"latency samples per stage (default {QUERIES})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='-', help="JSON report path, or '-' for stdout (default)")
+    parser.add_argument('--compare', help="previous JSON report to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help=f"allowed slowdown before a stage counts as a regression (default {TOLERANCE:.0%})")
+    parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single is not None:
+        json.dump(run_size(args.single, args.queries, args.seed), sys.stdout)
+        return 0
+
+    report = {'environment': environment(), 'queries': args.queries, 'seed': args.seed, 'runs': []}
+    for n in args.sizes:
+        run = run_isolated(n, args.queries, args.seed)
+        report['runs'].append(run)
+        print(f"{n:>9,} listings  peak {run['peak_rss_mb']:,.0f} MiB  "
+              + "  ".join(f"{name}={headline(stage)}" for name, stage in run['stages'].items()), file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        Path(args.output).write_text(text + "\n", encoding='utf-8')
+
+    if args.compare:
+        lines, regressed = compare(report, json.loads(Path(args.compare).read_text(encoding='utf-8')), args.tolerance)
+        print("\n".join(lines), file=sys.stderr)
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
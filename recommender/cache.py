@@ -0,0 +1,99 @@
+"""Process-wide LRUs shared by every caller of one engine: ranked results and rendered card HTML."""
+import sys
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """LRU of ranked (rows, scores), bounded by the bytes of the stored arrays.
+
+    All entries belong to one catalog version and are dropped as soon as a different
+    version is seen, so a catalog change never serves stale ranks.
+    """
+    ENTRY_OVERHEAD = 512  # Rough per-entry cost of the key, tuple and dict slot
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.version = None
+        self.bytes = self.hits = self.misses = self.evictions = 0
+        self.lock = threading.Lock()
+
+    def _use_version(self, version):
+        if version != self.version:
+            self.entries.clear()
+            self.version, self.bytes = version, 0
+
+    def get(self, version, key):
+        with self.lock:
+            self._use_version(version)
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, version, key, rows, scores):
+        rows, scores = rows.copy(), scores.copy()
+        rows.setflags(write=False)
+        scores.setflags(write=False)
+        size = rows.nbytes + scores.nbytes + self.ENTRY_OVERHEAD
+        with self.lock:
+            self._use_version(version)
+            if key in self.entries:
+                return
+            self.entries[key] = (rows, scores, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self.entries:
+                self.bytes -= self.entries.popitem(last=False)[1][2]
+                self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                    'entries': len(self.entries), 'bytes': self.bytes, 'evictions': self.evictions}
+
+
+class FragmentCache:
+    """LRU of rendered HTML fragments, bounded by the bytes of the stored strings.
+
+    One instance holds one catalog version (the caller keys instances by version), so no
+    version check is needed; the bound keeps a large catalog browsed in every language from
+    accumulating rows x languages fragments.
+    """
+    ENTRY_OVERHEAD = 128  # Rough per-entry cost of the key tuple and dict slot
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = self.hits = self.misses = self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, fragment):
+        size = sys.getsizeof(fragment) + self.ENTRY_OVERHEAD
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = (fragment, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self.entries:
+                self.bytes -= self.entries.popitem(last=False)[1][1]
+                self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries), 'bytes': self.bytes,
+                    'evictions': self.evictions}
@@ -0,0 +1,40 @@
+"""HTML for the InternMate result cards, free of Streamlit so pages can be rendered (and timed) headless."""
+import numpy as np
+
+# Only the border depends on the query; the card body depends on the listing and language alone
+CARD_BORDER_HTML = "<div class='internship-card' style='border-left: 5px solid {border_color};'>"
+CARD_BODY_HTML = (
+    "<div class='card-image-container'><img class='card-image' src=\"{image_url}\" alt=\"{role} Image\"></div>"
+    "<div class='card-content'>"
+    "<div class='card-header'><div class='card-title'>{role}</div><div class='card-location'>📍 {location}</div></div>"
+    "<div class='card-stipend'>💵 {stipend_label}: {stipend}</div>"
+    "<div class='card-description'>{description}</div>"
+    "<div class='card-skills'>{skill_tags}</div>"
+    "</div></div>"
+)
+
+
+def card_bodies(catalog, rows, stipend_label):
+    """Card body HTML for each listing row, in order."""
+    subset = catalog.iloc[rows]
+    return [
+        CARD_BODY_HTML.format(
+            image_url=image_url, role=role, location=location.split('(')[0].strip(),
+            stipend_label=stipend_label, stipend=stipend, description=description,
+            skill_tags="".join(f"<span class='skill-tag'>💡 {skill.strip()}</span>" for skill in skills.split(',')),
+        )
+        for image_url, role, location, stipend, description, skills in zip(
+            subset['image_url'].tolist(), subset['role'].tolist(), subset['location'].tolist(),
+            subset['stipend'].tolist(), subset['description'].tolist(), subset['skills'].tolist())
+    ]
+
+
+def card_grid(bodies, scores):
+    """The card grid for one page; scores=None (no query) gives every card the neutral border."""
+    if scores is None:
+        border_colors = ["#D3D3D3"] * len(bodies) # Default low match
+    else:
+        # Green for high match, orange for medium match, blue if weak match but matches filter
+        border_colors = np.select([scores > 0.5, scores > 0.2], ["#4CAF50", "#FFA500"], "#007bff").tolist()
+    cards = [CARD_BORDER_HTML.format(border_color=border_color) + body for border_color, body in zip(border_colors, bodies)]
+    return "<div class='card-grid'>" + "".join(cards) + "</div>"
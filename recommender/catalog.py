@@ -0,0 +1,129 @@
+"""Catalog loading: raw listings to a typed DataFrame, plus per-city / per-work-mode row masks."""
+import json
+
+from . import store
+
+# Listings shipped with the app; standardized location names keep filtering simple
+BUILTIN_LISTINGS = {
+    'company': [
+        'Tech Innovators Inc.', 'Data Wizards Ltd.', 'Creative Solutions Co.',
+        'Global Marketing Agency', 'AI Driven Insights', 'Quantum Tech',
+        'Financial Futures', 'Health Tech Solutions', 'Sustainable Energy Co.',
+        'GameDev Studio', 'Product Pulse Co.', 'PM Solutions Hub',
+        'E-Commerce Giants', 'FinTech Forward'
+    ],
+    'role': [
+        'Software Engineer Intern', 'Data Analyst Intern', 'UI/UX Design Intern',
+        'Digital Marketing Intern', 'Machine Learning Intern', 'Cloud Computing Intern',
+        'Financial Analyst Intern', 'Healthcare Data Intern', 'Environmental Analyst Intern',
+        'Game Developer Intern', 'Product Management Intern', 'PM Intern',
+        'Frontend Developer Intern', 'Risk Analyst Intern'
+    ],
+    'location': [
+        'Remote', 'Mumbai (On-site)', 'Delhi (Hybrid)', 'Remote',
+        'Bangalore (On-site)', 'Remote', 'Chennai (Hybrid)',
+        'Pune (On-site)', 'Remote', 'Hyderabad (Hybrid)', 'Mumbai (On-site)', 'Delhi (On-site)',
+        'Remote', 'Mumbai (Hybrid)'
+    ],
+    'stipend': [
+        '₹15,000', '₹20,000', '₹12,000', '₹10,000',
+        '₹25,000', '₹18,000', '₹16,000', '₹22,000',
+        '₹14,000', '₹17,000', '₹21,000', '₹20,000',
+        '₹18,000', '₹23,000'
+    ],
+    'description': [
+        'Developing web applications using Python and React.',
+        'Analyzing large datasets and creating data visualizations.',
+        'Designing user interfaces and creating wireframes for mobile apps.',
+        'Managing social media campaigns and creating content.',
+        'Building and training machine learning models.',
+        'Working on cloud infrastructure and deployment pipelines.',
+        'Assisting with financial modeling and market analysis.',
+        'Processing and analyzing patient data for insights.',
+        'Researching and analyzing data for renewable energy projects.',
+        'Developing game mechanics and level design using Unity.',
+        'Assisting with product roadmaps, market research, and feature ideation.',
+        'A hands-on role in a PM team, assisting with product strategy and launch.',
+        'Building responsive user interfaces with React and Tailwind CSS.',
+        'Analyzing financial risks and building predictive models.'
+    ],
+    'skills': [
+        'Python, React, JavaScript, Git', 'Python, Pandas, SQL, Visualization',
+        'Figma, Sketch, UI/UX, Prototyping', 'SEO, SEM, Social Media, Content Creation',
+        'Python, TensorFlow, Scikit-learn, NLP', 'AWS, Azure, Docker, Kubernetes',
+        'Excel, Financial Modeling, Data Analysis', 'SQL, Python, Data Cleaning, Statistics',
+        'Python, GIS, R, Data Analysis', 'Unity, C#, Game Design, 3D Modeling',
+        'Product Management, Market Research, Agile, JIRA', 'Product Strategy, Agile, Scrum, Market Analysis',
+        'React, JavaScript, HTML, CSS, Tailwind', 'Python, R, Risk Analysis, Statistics'
+    ],
+    'image_url': [
+        'https://placehold.co/400x150/007bff/ffffff?text=Software', 
+        'https://placehold.co/400x150/4CAF50/ffffff?text=Data',
+        'https://placehold.co/400x150/FFC107/ffffff?text=Design',
+        'https://placehold.co/400x150/FF5722/ffffff?text=Marketing',
+        'https://placehold.co/400x150/9C27B0/ffffff?text=ML/AI',
+        'https://placehold.co/400x150/00BCD4/ffffff?text=Cloud',
+        'https://placehold.co/400x150/F44336/ffffff?text=Finance',
+        'https://placehold.co/400x150/795548/ffffff?text=Health',
+        'https://placehold.co/400x150/607D8B/ffffff?text=Energy',
+        'https://placehold.co/400x150/E91E63/ffffff?text=Gaming',
+        'https://placehold.co/400x150/3F51B5/ffffff?text=Product',
+        'https://placehold.co/400x150/03A9F4/ffffff?text=PM',
+        'https://placehold.co/400x150/8BC34A/ffffff?text=Frontend',
+        'https://placehold.co/400x150/673AB7/ffffff?text=Risk'
+    ]
+}
+
+
+def parse_catalog(df):
+    """Adds the typed columns parsed once at load time: numeric stipend, city and work mode.
+
+    City and mode are split out of strings like "Mumbai (On-site)"; plain "Remote" has no city.
+    """
+    import pandas as pd
+
+    df['stipend_numeric'] = pd.to_numeric(df['stipend'].str.replace(r'[₹,]', '', regex=True), errors='coerce').fillna(0).astype(int)
+    parsed = df['location'].str.extract(r'^\s*(?P<city>[^(]*?)\s*(?:\((?P<mode>[^)]*)\))?\s*$')
+    is_remote = parsed['city'].str.lower().eq('remote') & parsed['mode'].isna()
+    parsed.loc[is_remote, 'mode'] = 'Remote'
+    parsed.loc[is_remote, 'city'] = None
+    df['city'] = parsed['city'].astype('category')
+    df['work_mode'] = parsed['mode'].fillna('On-site').astype('category')
+    return df
+
+
+def load_catalog(listings=None):
+    """Typed catalog for `listings` ({column: values}; defaults to BUILTIN_LISTINGS).
+
+    The content hash of the raw listings is the catalog version, stored in `df.attrs['version']`;
+    it keys the on-disk store and every index derived from this dataset. Numeric and
+    categorical columns come back memory-mapped read-only and uncopied (recommender.store), so
+    the catalog is shared by every process on the host, and writing one of them in place raises
+    ValueError instead of letting the frame drift from arrays derived from it (engine.stipends).
+    """
+    import pandas as pd
+
+    listings = BUILTIN_LISTINGS if listings is None else listings
+    version = store.content_hash(json.dumps(listings, sort_keys=True, ensure_ascii=False))
+    key = f"catalog-{version}"
+    stored = store.load(key)
+    if stored is None:
+        store.save(key, frame=parse_catalog(pd.DataFrame(listings)))
+        # reopen mapped, so the process that built the catalog holds the same pages as the rest
+        stored = store.load(key)
+    df = stored['frame']
+    df.attrs['version'] = version
+    return df
+
+
+def build_filter_index(df):
+    """Precomputes one read-only boolean row mask per city and per work mode."""
+    def masks(column):
+        codes = column.cat.codes.to_numpy()
+        return {value: _read_only(codes == code) for code, value in enumerate(column.cat.categories)}
+    return {'city': masks(df['city']), 'work_mode': masks(df['work_mode'])}
+
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
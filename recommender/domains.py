@@ -0,0 +1,58 @@
+"""Domain tags computed once per listing and stored as a bitmask.
+
+Each domain has one compiled, case-insensitive pattern. The domain's own name matches
+anywhere in the text, as the old per-rerun substring filter did ("redesign" is Design,
+"refinance" is Finance), so every listing that filter selected is still tagged; the other
+synonyms match whole words, and `*` marks a stem ("prototyp*" also matches "prototyping").
+Tagging runs each pattern once over the whole
+description column at ingestion, so selecting any set of domains later is a single
+vectorized bitwise AND over the `domain_bits` column.
+"""
+import re
+
+import numpy as np
+
+DOMAIN_SYNONYMS = {
+    'Data Science': ['data science', 'data scien*', 'machine learning', 'deep learning', 'data analy*', 'analytics',
+                     'pandas', 'scikit-learn', 'statistic*', 'data visuali*', 'model evaluation', 'data cleaning'],
+    'Web Dev': ['web dev*', 'frontend', 'front-end', 'backend', 'back-end', 'full stack', 'html', 'css', 'javascript',
+                'react', 'responsive web', 'web app*'],
+    'Marketing': ['marketing', 'seo', 'sem', 'social media', 'content creation', 'campaign*', 'brand*', 'copywriting'],
+    'Design': ['design*', 'ui/ux', 'ux', 'figma', 'wireframe*', 'prototyp*', 'illustrat*', 'animation'],
+    'Finance': ['financ*', 'fintech', 'accounting', 'investment*', 'valuation', 'banking', 'risk analy*'],
+    'Research': ['research*', 'literature review', 'experiment*', 'publication*'],
+}
+DOMAINS = list(DOMAIN_SYNONYMS)
+BITS_DTYPE = np.uint8   # one bit per domain; widen if DOMAINS outgrows it
+
+_patterns = None
+
+
+def domain_patterns():
+    """One compiled pattern per domain, in DOMAINS order (bit i is DOMAINS[i])."""
+    global _patterns
+    if _patterns is None:
+        def term(synonym):
+            stem = synonym.endswith('*')
+            return re.escape(synonym.rstrip('*')) + (r"\w*" if stem else "")
+        _patterns = [re.compile(re.escape(name) + r"|\b(?:" + "|".join(term(s) for s in synonyms) + r")\b", re.IGNORECASE)
+                     for name, synonyms in DOMAIN_SYNONYMS.items()]
+    return _patterns
+
+
+def tag_domains(descriptions):
+    """Domain bitmask per description (a pandas Series of text)."""
+    bits = np.zeros(len(descriptions), dtype=BITS_DTYPE)
+    for bit, pattern in enumerate(domain_patterns()):
+        bits[descriptions.str.contains(pattern, na=False).to_numpy(dtype=bool)] |= BITS_DTYPE(1 << bit)
+    return bits
+
+
+def domain_bits(names):
+    """The bits of the named domains; unknown names select nothing."""
+    return sum(1 << DOMAINS.index(name) for name in set(names) if name in DOMAIN_SYNONYMS)
+
+
+def has_domain(bits, names):
+    """Boolean mask of listings tagged with at least one of the named domains."""
+    return (bits & BITS_DTYPE(domain_bits(names))) != 0
@@ -0,0 +1,212 @@
+"""Recommender: one catalog version with its filter masks, TF-IDF index and shared result cache."""
+import threading
+
+import numpy as np
+
+from .cache import ResultCache
+from .catalog import build_filter_index, load_catalog
+from .memo import NO_MEMO
+from .ranking import score_postings, select_candidates, top_k
+from .resume import build_skill_matcher
+from .tracing import NO_TRACE
+
+TOP_K = 50                 # Maximum number of recommendations returned per search
+MIN_SCORE = 0.0            # Listings must score strictly above this to be recommended
+RESULT_CACHE_BYTES = 32 * 1024 * 1024   # Memory shared by cached rankings across all sessions
+
+WORK_MODES = ('Any', 'Online', 'Offline')
+RETRIEVAL_MODES = ('exact', 'ann', 'sharded')
+
+
+class Recommender:
+    """Filtering, scoring and top-K over an immutable typed catalog (see catalog.load_catalog).
+
+    One instance is meant to be shared by every session of a process. Callers get back row
+    ids and score arrays, never catalog copies, so per-request memory follows the result
+    size rather than the catalog size. Safe to share between threads: the search indexes and skill matcher are built lazily under
+    a lock, and everything else is read-only after construction. retrieval='ann' answers
+    queries from the LSA / IVF index (recommender.lsa) instead of exact sparse search;
+    retrieval='sharded' runs exact search over row shards in parallel (recommender.sharded).
+    similar() reads the precomputed neighbour graph (recommender.neighbours), which requests
+    only ever map from the store: build_neighbour_graph() computes it once, when the engine is
+    created or offline (python -m recommender.neighbours --build). Given the `previous` catalog
+    it replaces, the graph is updated from that version's instead of rebuilt.
+    """
+
+    def __init__(self, catalog, result_cache_bytes=RESULT_CACHE_BYTES, retrieval='exact', ann_options=None,
+                 shard_options=None, previous=None):
+        if retrieval not in RETRIEVAL_MODES:
+            raise ValueError(f"retrieval must be one of {', '.join(RETRIEVAL_MODES)}")
+        self.catalog = catalog
+        self.version = catalog.attrs['version']
+        self.filters = build_filter_index(catalog)
+        self.stipends = catalog['stipend_numeric'].to_numpy()
+        self.stipends.setflags(write=False)
+        self.result_cache = ResultCache(result_cache_bytes)
+        self.retrieval, self.ann_options, self.shard_options = retrieval, ann_options or {}, shard_options or {}
+        self.previous = previous
+        self._index = self._ann_index = self._sharded_search = self._neighbour_graph = self._skill_matcher = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def builtin(cls, **kwargs):
+        """Engine over the listings shipped with the app."""
+        return cls(load_catalog(), **kwargs)
+
+    @property
+    def index(self):
+        """The TfidfIndex for this catalog version, fitted (or mapped from the store) on first use."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    from .tfidf import TfidfIndex
+                    self._index = TfidfIndex.build(self.catalog)
+        return self._index
+
+    @property
+    def ann_index(self):
+        """The LsaIndex over this catalog's TF-IDF, trained (or mapped from the store) on first use."""
+        if self._ann_index is None:
+            index = self.index
+            with self._lock:
+                if self._ann_index is None:
+                    from .lsa import LsaIndex
+                    self._ann_index = LsaIndex.build(index, self.version, **self.ann_options)
+        return self._ann_index
+
+    @property
+    def sharded_search(self):
+        """The ShardedSearch over this catalog's inverted index, with its worker pool started on first use."""
+        if self._sharded_search is None:
+            index = self.index
+            with self._lock:
+                if self._sharded_search is None:
+                    from .sharded import ShardedSearch
+                    self._sharded_search = ShardedSearch(index.inverted_index, store_key=f"index-{self.version}",
+                                                         **self.shard_options)
+        return self._sharded_search
+
+    @property
+    def neighbour_graph(self):
+        """The NeighbourGraph of this catalog version, mapped from the store on first use; None until one is built."""
+        if self._neighbour_graph is None:
+            with self._lock:
+                if self._neighbour_graph is None:
+                    from .neighbours import stored_graph
+                    self._neighbour_graph = stored_graph(self.catalog)
+        return self._neighbour_graph
+
+    def build_neighbour_graph(self):
+        """Computes and stores the neighbour graph, or maps it when already stored; returns it.
+
+        Minutes per 100k listings on a cold store, so call it at startup or offline, never per request.
+        """
+        index = self.index
+        with self._lock:
+            if self._neighbour_graph is None:
+                from .neighbours import neighbour_graph
+                self._neighbour_graph = neighbour_graph(index, self.catalog, previous=self.previous)
+                self.previous = None
+        return self._neighbour_graph
+
+    @property
+    def skill_matcher(self):
+        if self._skill_matcher is None:
+            with self._lock:
+                if self._skill_matcher is None:
+                    self._skill_matcher = build_skill_matcher(self.catalog['skills'].tolist())
+        return self._skill_matcher
+
+    @property
+    def cities(self):
+        return sorted(self.filters['city'])
+
+    def mask(self, work_mode='Any', location=None, min_stipend=0):
+        """Boolean row mask for the filters; `work_mode` is one of WORK_MODES, `location` a city or None."""
+        if work_mode not in WORK_MODES:
+            raise ValueError(f"work_mode must be one of {', '.join(WORK_MODES)}")
+        mask = np.ones(len(self.catalog), dtype=bool)
+        no_rows = np.zeros(len(self.catalog), dtype=bool)
+
+        remote_rows = self.filters['work_mode'].get('Remote', no_rows)
+        if work_mode == 'Online':
+            mask &= remote_rows
+        elif work_mode == 'Offline':
+            # Offline excludes 'Remote' locations
+            mask &= ~remote_rows
+
+        if location is not None:
+            mask &= self.filters['city'].get(location, no_rows)
+
+        mask &= self.stipends >= min_stipend
+        return mask
+
+    def has_listings(self, work_mode='Any', location=None, min_stipend=0):
+        """Whether any listing passes the filters."""
+        return bool(self.mask(work_mode, location, min_stipend).any())
+
+    def listings(self, rows):
+        """Catalog rows for `rows`, in that order, positioned 0..len(rows)-1 (see recommender.cards)."""
+        return self.catalog.iloc[rows]
+
+    def similar(self, row, k=None):
+        """The listings most like catalog row `row`, as (rows, scores), best first; a lookup in the neighbour graph.
+
+        Empty until the graph has been built (build_neighbour_graph).
+        """
+        graph = self.neighbour_graph
+        if graph is None:
+            return np.array([], dtype=int), np.array([])
+        return graph.similar(row, k)
+
+    def recommend(self, query='', work_mode='Any', location=None, min_stipend=0, k=TOP_K, min_score=MIN_SCORE,
+                  trace=NO_TRACE, memo=NO_MEMO):
+        """Top k catalog rows for the query and filters, as (rows, scores).
+
+        With a query, listings are ranked by TF-IDF similarity and results are shared through
+        the result cache. Without one, the filtered listings are ranked by stipend and scores is None.
+        Stages are recorded as spans on `trace` (see recommender.tracing). With a per-session
+        `memo` (recommender.memo), each stage is keyed on its own inputs only: a filter change
+        reuses the query vector and the scores of every listing, and an unchanged request
+        reuses the ranking.
+        """
+        with trace.span('filter'):
+            filters = (self.version, work_mode, location, min_stipend)
+            mask = memo.get('mask', filters, lambda: self.mask(work_mode, location, min_stipend))
+        if not query:
+            with trace.span('stipend_rank'):
+                def stipend_rank():
+                    filtered_rows = np.flatnonzero(mask)
+                    return filtered_rows[top_k(self.stipends[filtered_rows], k)], None
+                return memo.get('ranking', (filters, None, k), stipend_rank)
+        if not mask.any():
+            return np.array([], dtype=int), np.array([])
+
+        with trace.span('tfidf_index'):
+            index = self.index
+            # The analyzed terms (order-free, as TF-IDF sees them) plus the filters identify the ranking
+            terms = index.terms(query)
+
+        def rank():
+            key = (terms, work_mode, location, min_stipend, k, min_score)
+            with trace.span('result_cache'):
+                cached = self.result_cache.get(self.version, key)
+            if cached is not None:
+                return cached
+            if self.retrieval == 'ann':
+                with trace.span('ann_search'):
+                    rows, scores = self.ann_index.search(query, mask, k, min_score)
+            elif self.retrieval == 'sharded':
+                with trace.span('sharded_search'):
+                    query_vector = memo.get('query_vector', (self.version, query), lambda: index.transform(query))
+                    rows, scores = self.sharded_search.search(query_vector, mask, k, min_score)
+            else:
+                with trace.span('query_scores'):
+                    query_vector = memo.get('query_vector', (self.version, query), lambda: index.transform(query))
+                    candidates, candidate_scores = memo.get('scores', (self.version, terms),
+                                                            lambda: score_postings(index.inverted_index, query_vector))
+                with trace.span('exact_search'):
+                    rows, scores = select_candidates(candidates, candidate_scores, mask, k, min_score)
+            self.result_cache.put(self.version, key, rows, scores)
+            return rows, scores
+        return memo.get('ranking', (filters, terms, k, min_score, self.retrieval), rank)
@@ -0,0 +1,212 @@
+"""Hashed TF-IDF index that supports appending and tombstoning listings without a refit."""
+import copy
+
+import numpy as np
+import scipy.sparse as sp
+
+from . import store
+from .ranking import score_postings, top_k
+
+# A fixed hashing vocabulary lets chunks be indexed as they stream in and listings be
+# added later without a refit; IDF comes from incrementally maintained document frequencies.
+N_FEATURES = 2 ** 18
+EXPLAIN_TERMS = 3   # query terms named per result by IncrementalIndex.explain
+
+_hasher = None
+
+
+def hasher():
+    global _hasher
+    if _hasher is None:
+        from sklearn.feature_extraction.text import HashingVectorizer
+        _hasher = HashingVectorizer(stop_words='english', n_features=N_FEATURES, alternate_sign=False, norm=None)
+    return _hasher
+
+
+def count_terms(descriptions):
+    """Hashed term counts for a batch of descriptions, plus how many of them contain each term."""
+    counts = hasher().transform(descriptions)
+    return counts, np.bincount(counts.indices, minlength=N_FEATURES)
+
+
+class IncrementalIndex:
+    """TF-IDF index over hashed term counts that supports appending and tombstoning listings.
+
+    Document frequencies are maintained incrementally. Listings added since the last compaction
+    are weighted with the current IDF and scored directly from a small delta segment, so adding
+    n listings costs O(n) rather than a refit. compact() drops tombstoned rows, reweights every
+    row with fresh IDF and rebuilds the inverted index; it is meant to be run off-peak.
+
+    Arrays are never modified in place: add/remove/compact rebind new ones. A fork() therefore
+    shares every array with its parent until it diverges, which lets many sessions start from
+    one process-wide index at no per-session cost.
+    """
+
+    def __init__(self, counts, doc_freq=None, inverted=None):
+        self.blocks = [counts]   # raw hashed counts per batch, kept for reweighting
+        self.doc_freq = np.bincount(counts.indices, minlength=N_FEATURES) if doc_freq is None else np.asarray(doc_freq, dtype=np.int64)
+        self.alive = np.ones(counts.shape[0], dtype=bool)
+        self.version = 0
+        if inverted is None:
+            self._rebuild_main()
+        else:
+            # prebuilt (e.g. memory-mapped) inverted index over exactly these counts
+            self._update_idf()
+            self.inverted, self.main_rows, self.delta = inverted, counts.shape[0], None
+
+    def fork(self):
+        """An independent index sharing this one's arrays; changes to either are not seen by the other."""
+        clone = copy.copy(self)
+        clone.blocks = list(self.blocks)
+        return clone
+
+    def freeze(self):
+        """Marks the arrays read-only, so code that would modify a shared index in place fails loudly."""
+        for array in (self.doc_freq, self.alive, self.idf):
+            array.setflags(write=False)
+        return self
+
+    @property
+    def delta_rows(self):
+        return len(self.alive) - self.main_rows
+
+    def _update_idf(self):
+        # smoothed IDF over live listings, same formula as TfidfVectorizer
+        self.idf = np.log((1 + int(self.alive.sum())) / (1 + self.doc_freq)) + 1
+
+    def _weigh(self, counts):
+        from sklearn.preprocessing import normalize
+        weighted = counts.copy()
+        weighted.data *= self.idf[weighted.indices]
+        return normalize(weighted)
+
+    def _rebuild_main(self):
+        self._update_idf()
+        counts = self.blocks[0] if len(self.blocks) == 1 else sp.vstack(self.blocks, format='csr')
+        self.blocks = [counts]
+        # column-major copy is the inverted index: term -> (listing ids, weights)
+        self.inverted = self._weigh(counts).tocsc()
+        self.main_rows = counts.shape[0]
+        self.delta = None
+
+    def _counts_of(self, rows):
+        offsets = np.cumsum([0] + [block.shape[0] for block in self.blocks])
+        parts = [block[rows[(rows >= start) & (rows < end)] - start]
+                 for block, start, end in zip(self.blocks, offsets[:-1], offsets[1:])]
+        return sp.vstack(parts, format='csr')
+
+    def add(self, counts):
+        """Append listings; returns their row ids. Cost is proportional to the new rows only."""
+        start = len(self.alive)
+        self.blocks.append(counts)
+        self.doc_freq = self.doc_freq + np.bincount(counts.indices, minlength=N_FEATURES)
+        self.alive = np.concatenate([self.alive, np.ones(counts.shape[0], dtype=bool)])
+        self._update_idf()
+        weighted = self._weigh(counts)
+        self.delta = weighted if self.delta is None else sp.vstack([self.delta, weighted], format='csr')
+        self.version += 1
+        return np.arange(start, start + counts.shape[0])
+
+    def remove(self, rows):
+        """Tombstone listings: they stop matching at once and are dropped at the next compaction."""
+        rows = np.unique(np.asarray(rows, dtype=int))
+        rows = rows[self.alive[rows]]
+        if not len(rows):
+            return
+        alive = self.alive.copy()
+        alive[rows] = False
+        self.alive = alive
+        self.doc_freq = self.doc_freq - np.bincount(self._counts_of(rows).indices, minlength=N_FEATURES)
+        self._update_idf()
+        self.version += 1
+
+    def compact(self):
+        """Drop tombstoned rows and reweight everything with fresh IDF; returns the surviving old row ids."""
+        keep = np.flatnonzero(self.alive)
+        counts = sp.vstack(self.blocks, format='csr')[keep]
+        self.blocks = [counts]
+        self.doc_freq = np.bincount(counts.indices, minlength=N_FEATURES)
+        self.alive = np.ones(len(keep), dtype=bool)
+        self._rebuild_main()
+        self.version += 1
+        return keep
+
+    def vectorize(self, text):
+        from sklearn.preprocessing import normalize
+        vec = hasher().transform([text])
+        vec.data *= self.idf[vec.indices]
+        return normalize(vec)
+
+    def search(self, text, mask, k, min_score):
+        """Top k (rows, scores) among live listings in `mask` that share a term with `text`."""
+        query_vec = self.vectorize(text)
+        candidates, scores = score_postings(self.inverted, query_vec)
+        if self.delta is not None:
+            delta_scores = (self.delta @ query_vec.T).toarray().ravel()
+            hits = np.flatnonzero(delta_scores)
+            candidates = np.concatenate([candidates, self.main_rows + hits])
+            scores = np.concatenate([scores, delta_scores[hits]])
+        keep = mask[candidates] & self.alive[candidates] & (scores > min_score)
+        candidates, scores = candidates[keep], scores[keep]
+        best = top_k(scores, k)
+        return candidates[best], scores[best]
+
+    def explain(self, text, rows, n_terms=EXPLAIN_TERMS):
+        """The query terms behind each row's score, as [(term, share of the score)] per row, largest first.
+
+        A cosine score is the sum over query terms of query weight x listing weight, so one
+        elementwise product of the query vector with the selected rows' weights gives every
+        term's contribution for every row. Only the query is tokenised, to name its hashed
+        features; terms that collide in the hash are named together ("sql/tableau").
+        """
+        rows = np.asarray(rows, dtype=int)
+        query_vec = self.vectorize(text)
+        features = query_vec.indices
+        if not len(rows) or not len(features):
+            return [[] for _ in rows]
+
+        tokens = sorted(set(hasher().build_analyzer()(text)))
+        token_counts = hasher().transform(tokens)
+        names = {}
+        for token, feature in zip(np.repeat(tokens, np.diff(token_counts.indptr)).tolist(), token_counts.indices.tolist()):
+            names[feature] = names[feature] + '/' + token if feature in names else token
+        labels = [names.get(feature, '?') for feature in features.tolist()]
+
+        # (rows, query terms) listing weights: main rows are binary-searched in each query term's
+        # postings (row ids are sorted within a column), rows added since compaction come from the delta
+        weights = np.zeros((len(rows), len(features)))
+        main = rows < self.main_rows
+        if main.any():
+            main_rows = rows[main]
+            indptr, indices, data = self.inverted.indptr, self.inverted.indices, self.inverted.data
+            for column, feature in enumerate(features.tolist()):
+                start, end = indptr[feature], indptr[feature + 1]
+                if start == end:
+                    continue
+                at = np.minimum(np.searchsorted(indices[start:end], main_rows), end - start - 1) + start
+                weights[main, column] = np.where(indices[at] == main_rows, data[at], 0.0)
+        if not main.all():
+            weights[~main] = self.delta[rows[~main] - self.main_rows][:, features].toarray()
+        contributions = weights * query_vec.data
+
+        order = np.argsort(-contributions, axis=1, kind='stable')[:, :n_terms]
+        top = np.take_along_axis(contributions, order, axis=1)
+        totals = contributions.sum(axis=1, keepdims=True)
+        shares = top / np.where(totals > 0, totals, 1)
+        return [[(labels[term], share) for term, share, value in zip(row_terms, row_shares, row_values) if value > 0]
+                for row_terms, row_shares, row_values in zip(order.tolist(), shares.tolist(), top.tolist())]
+
+
+def save_indexed_catalog(key, catalog, index, meta=None):
+    """Persist a freshly built catalog and index so other processes can map it instead of rebuilding."""
+    store.save(key, frame=catalog, matrices={'counts': index.blocks[0], 'inverted': index.inverted},
+               arrays={'doc_freq': index.doc_freq}, meta=meta)
+
+
+def load_indexed_catalog(key):
+    """(catalog, IncrementalIndex, meta) for a stored entry, or None."""
+    stored = store.load(key)
+    if stored is None:
+        return None
+    matrices = stored['matrices']
+    return stored['frame'], IncrementalIndex(matrices['counts'], stored['arrays']['doc_freq'], matrices['inverted']), stored['meta']
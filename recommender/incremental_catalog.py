@@ -0,0 +1,169 @@
+"""Editable listings catalog: a listings frame with its hashed IncrementalIndex, as namira serves it.
+
+IncrementalCatalog is the engine behind namira_app: filtering, ranking with per-result
+explanations, appending uploaded listings (a re-posted (company, role) replaces the older
+listing) and compaction, as a plain Python API. Catalogs built from the sample listings or
+from a CSV are persisted per content hash (recommender.store), so every process on the host
+maps the same frame and index instead of ingesting again.
+
+One frozen catalog can be shared by every session of a process; fork() gives a session its
+own copy that shares the frame and index arrays until it appends or compacts.
+"""
+import json
+
+import numpy as np
+
+from .domains import has_domain, tag_domains
+from .engine import MIN_SCORE, TOP_K
+from .incremental import IncrementalIndex, count_terms, load_indexed_catalog, save_indexed_catalog
+from .ingest import catalog_key, ingest_csv
+
+
+class IncrementalCatalog:
+    """Listings (`frame`, one row per index row) searched through an IncrementalIndex.
+
+    `name` says where the listings came from (e.g. 'sample' or an upload id); with the index
+    version it identifies the catalog's current contents.
+    """
+
+    def __init__(self, frame, index, name='sample'):
+        self.frame = frame
+        self.index = index
+        self.name = name
+        self.frozen = False
+        self._keys = None   # (company, role) -> live row, built on the first append
+
+    @classmethod
+    def from_listings(cls, listings, name='sample'):
+        """Catalog of `listings` (a list of {column: value} records), mapped from the store when already built."""
+        import pandas as pd
+
+        key = catalog_key(json.dumps(listings, sort_keys=True))
+        stored = load_indexed_catalog(key)
+        if stored is None:
+            frame = pd.DataFrame(listings)
+            frame['domain_bits'] = tag_domains(frame['description'])
+            save_indexed_catalog(key, frame, IncrementalIndex(count_terms(frame['description'])[0]))
+            stored = load_indexed_catalog(key)
+        frame, index, _ = stored
+        return cls(frame, index, name)
+
+    @classmethod
+    def from_csv(cls, source, name, progress=None):
+        """(catalog, rejected rows) for the CSV in `source`, a binary file object such as an upload.
+
+        The same file ingested before (by any process on the host) is mapped from the store;
+        otherwise it is ingested in chunks (recommender.ingest, which raises ValueError for an
+        unusable file) and stored. `progress` is passed to ingest_csv.
+        """
+        key = catalog_key(source.getvalue())
+        stored = load_indexed_catalog(key)
+        if stored is None:
+            frame, counts, doc_freq, rejected = ingest_csv(source, progress)
+            index = IncrementalIndex(counts, doc_freq)
+            save_indexed_catalog(key, frame, index, {'rejected': rejected})
+        else:
+            frame, index, meta = stored
+            rejected = meta['rejected']
+        return cls(frame, index, name), rejected
+
+    def fork(self):
+        """An independent catalog sharing this one's frame and index arrays until either changes."""
+        clone = type(self)(self.frame, self.index.fork(), self.name)
+        clone._keys = None if self._keys is None else dict(self._keys)
+        return clone
+
+    def freeze(self):
+        """Marks the catalog shared: its arrays become read-only and append/compact raise until it is forked."""
+        self.index.freeze()
+        self.frozen = True
+        return self
+
+    @property
+    def version(self):
+        """Changes whenever the listings do: where they came from plus the index version."""
+        return self.name, self.index.version
+
+    @property
+    def live(self):
+        return int(self.index.alive.sum())
+
+    @property
+    def tombstoned(self):
+        return len(self.index.alive) - self.live
+
+    def mask(self, location='Any', min_stipend=0, domains=()):
+        """Boolean row mask for the filters.
+
+        `location` is matched as a case-insensitive substring ('Any' or empty keeps everything).
+        Domains (recommender.domains) narrow the mask only when at least one listing that
+        passes the other filters has one of them, so an unmatched domain never empties the results.
+        """
+        frame = self.frame
+        mask = np.ones(len(frame), dtype=bool)
+        if location and location != 'Any':
+            mask &= frame['location'].str.contains(location, case=False, na=False).to_numpy()
+        if min_stipend:
+            mask &= (frame['stipend'] >= min_stipend).to_numpy()
+        if domains:
+            # domain tags were computed once at ingestion; any set of domains is one bitwise test
+            domain_mask = mask & has_domain(frame['domain_bits'].to_numpy(), domains)
+            if domain_mask.any():
+                mask = domain_mask
+        return mask
+
+    def recommend(self, profile, mask, k=TOP_K, min_score=MIN_SCORE):
+        """Top k live rows in `mask` for the skills in `profile`, as (rows, scores, explanations).
+
+        explanations[i] is [(term, share of the score)] for rows[i] (IncrementalIndex.explain).
+        Without a profile the first k live listings in the mask are returned with zero scores.
+        """
+        if profile.strip():
+            rows, scores = self.index.search(profile, mask, k, min_score)
+            # which skill terms carried each score, for the whole top K in one sparse product
+            return rows, scores, self.index.explain(profile, rows)
+        rows = np.flatnonzero(mask & self.index.alive)[:k]
+        return rows, np.zeros(len(rows)), [[] for _ in rows]
+
+    def listings(self, rows):
+        """Frame rows for `rows`, in that order."""
+        return self.frame.iloc[rows]
+
+    def _check_writable(self):
+        if self.frozen:
+            raise ValueError("this catalog is shared; fork() it before changing it")
+
+    def append(self, other):
+        """Adds the live listings of catalog `other`; a re-posted (company, role) tombstones the older listing.
+
+        Within `other` the last listing of a (company, role) wins, as it would across uploads.
+        """
+        import pandas as pd
+        from pandas.api.types import union_categoricals
+
+        self._check_writable()
+        if self._keys is None:
+            alive = self.index.alive
+            self._keys = {key: row for row, key in enumerate(zip(self.frame['company'].tolist(), self.frame['role'].tolist()))
+                          if alive[row]}
+        other_alive = other.index.alive
+        latest = {key: row for row, key in enumerate(zip(other.frame['company'].tolist(), other.frame['role'].tolist()))
+                  if other_alive[row]}
+        keep = np.sort(np.fromiter(latest.values(), dtype=np.int64, count=len(latest)))
+        new = other.frame.iloc[keep]
+        new_keys = list(zip(new['company'].tolist(), new['role'].tolist()))
+        self.index.remove([self._keys[key] for key in new_keys if key in self._keys])
+        self._keys.update(zip(new_keys, self.index.add(other.index._counts_of(keep)).tolist()))
+
+        locations = union_categoricals([self.frame['location'].astype('category'), new['location'].astype('category')])
+        merged = pd.concat([self.frame.drop(columns='location'), new.drop(columns='location')], ignore_index=True)
+        merged.insert(self.frame.columns.get_loc('location'), 'location', locations)
+        self.frame = merged
+
+    def compact(self):
+        """Drops tombstoned listings and reweights the index (IncrementalIndex.compact); returns the listings kept."""
+        self._check_writable()
+        keep = self.index.compact()
+        self.frame = self.frame.iloc[keep].reset_index(drop=True)
+        self._keys = None
+        return len(keep)
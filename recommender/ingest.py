@@ -0,0 +1,128 @@
+"""Chunked CSV ingestion: schema validation, dtype coercion and term hashing per chunk."""
+import csv
+import os
+import tempfile
+
+import numpy as np
+import scipy.sparse as sp
+
+from . import store
+from .domains import tag_domains
+from .incremental import N_FEATURES, count_terms
+
+REQUIRED_COLUMNS = ['company', 'role', 'location', 'stipend', 'description']
+CHUNK_ROWS = 20000   # rows parsed per chunk; bounds parser memory regardless of file size
+INGEST_SCHEMA = 3    # bumped whenever ingestion adds or changes columns, so stored catalogs are rebuilt
+
+
+def catalog_key(content):
+    """Store key for a catalog ingested from `content` (bytes or str) with the current schema."""
+    return f"hashed-v{INGEST_SCHEMA}-" + store.content_hash(content)
+
+
+def ingest_csv(source, progress=None, chunk_rows=CHUNK_ROWS):
+    """Stream a CSV (path or binary file object) in chunks and hash its descriptions as they arrive.
+
+    Returns (catalog, counts, doc_freq, rejected_rows). Malformed lines and rows without a
+    description or numeric stipend are dropped and counted instead of failing the whole file.
+    A stray quote makes the parser read on to the next quote, folding the rows in between into
+    one field: a multi-line field with a line holding a full row of delimiters is taken for
+    that, and rejected with every row it swallowed. When the parser gives up (an unterminated
+    quote), the chunks accepted so far are kept. Records the parser drops without a word are
+    found by reconciling line counts with the file, so every unparsed line counts as rejected.
+    Each listing is tagged with its domains (recommender.domains) in a `domain_bits` column.
+    `progress(fraction, loaded, rejected)` is called after each chunk; fraction is None when
+    the size of `source` is unknown. Raises ValueError for a missing column or no valid rows.
+
+    Memory stays near the size of the result: each chunk's hashed counts are spooled to a
+    temporary file and read back once, and the chunk frames are merged one column at a time,
+    each column released from the chunks as it is folded in.
+    """
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    size = getattr(source, 'size', None)
+    frames, row_terms = [], []   # row_terms: stored terms per accepted row, for the counts' indptr
+    data_spool, index_spool = tempfile.TemporaryFile(), tempfile.TemporaryFile()
+    doc_freq = np.zeros(N_FEATURES, dtype=np.int64)
+    loaded = rejected = consumed = 0   # consumed: data lines the parser has turned into records so far
+    bad_lines = []   # lines per skipped record, counted per call: the warnings machinery is process-wide
+
+    def skip_bad_line(fields):
+        bad_lines.append(1 + sum(field.count('\n') for field in fields if field))
+        return None
+
+    try:
+        for chunk in pd.read_csv(source, chunksize=chunk_rows, dtype=str, engine='python', on_bad_lines=skip_bad_line):
+            chunk.columns = chunk.columns.str.strip().str.lower()
+            missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"CSV must include columns: {', '.join(missing)}")
+
+            text = [chunk[column].fillna('') for column in chunk.columns]
+            spans = sum(values.str.count('\n') for values in text)   # extra lines each record was read from
+            swallowed = np.zeros(len(chunk), dtype=bool)
+            if spans.any():
+                row_like = rf"\n(?:[^\n,]*,){{{len(chunk.columns) - 1}}}"
+                for values in text:
+                    swallowed |= values.str.contains(row_like).to_numpy()
+            consumed += len(chunk) + int(spans.sum())
+            rejected += int((1 + spans)[swallowed].sum())
+
+            stipend = pd.to_numeric(chunk['stipend'].str.replace(r'[₹,\s]', '', regex=True), errors='coerce')
+            description = chunk['description'].fillna('').str.strip()
+            valid = stipend.notna() & description.ne('') & ~swallowed
+            rejected += int((~valid & ~swallowed).sum())
+            if valid.any():
+                chunk = pd.DataFrame({
+                    'company': chunk['company'][valid].fillna('').str.strip(),
+                    'role': chunk['role'][valid].fillna('').str.strip(),
+                    'location': chunk['location'][valid].fillna('').str.strip().astype('category'),
+                    'stipend': stipend[valid].astype('int64'),
+                    'description': description[valid],
+                })
+                chunk['domain_bits'] = tag_domains(chunk['description'])
+
+                counts, chunk_doc_freq = count_terms(chunk['description'])
+                counts.data.tofile(data_spool)
+                counts.indices.astype(np.int32, copy=False).tofile(index_spool)
+                row_terms.append(np.diff(counts.indptr))
+                doc_freq += chunk_doc_freq
+                frames.append(chunk)
+                loaded += len(chunk)
+            if progress is not None:
+                progress(min(source.tell() / max(size, 1), 1.0) if size else None, loaded, rejected + sum(bad_lines))
+    except (csv.Error, pd.errors.ParserError):
+        pass   # the parser stopped for good (e.g. an unterminated quote): keep the chunks accepted so far
+    # lines neither turned into records nor reported as bad were dropped by the parser
+    rejected += sum(bad_lines) + max(_data_lines(source) - consumed - sum(bad_lines), 0)
+    if not loaded:
+        raise ValueError('CSV contains no valid listings')
+
+    columns = {}
+    for name in list(frames[0].columns):
+        parts = [frame.pop(name) for frame in frames]
+        # per-chunk categoricals are merged without materialising the strings again
+        columns[name] = union_categoricals(parts) if name == 'location' else pd.concat(parts, ignore_index=True)
+        del parts
+    catalog = pd.DataFrame(columns, copy=False)
+
+    with data_spool, index_spool:
+        data_spool.seek(0)
+        index_spool.seek(0)
+        indptr = np.concatenate([[0], np.cumsum(np.concatenate(row_terms))])
+        counts = sp.csr_matrix((np.fromfile(data_spool, dtype=np.float64), np.fromfile(index_spool, dtype=np.int32), indptr),
+                               shape=(loaded, N_FEATURES))
+    return catalog, counts, doc_freq, rejected
+
+
+def _data_lines(source):
+    """Non-blank lines below the header of `source` (a path or seekable binary file object)."""
+    handle = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+    try:
+        handle.seek(0)
+        lines = sum(1 for line in handle if line.strip())
+    finally:
+        if handle is not source:
+            handle.close()
+    return max(lines - 1, 0)
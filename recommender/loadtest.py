@@ -0,0 +1,414 @@
+"""Concurrent-session load test for the Streamlit apps, driven headlessly on one machine.
+
+    python -m recommender.loadtest --apps app.py namira_app/app.py --sessions 20 --size 100000 -o load.json
+    python -m recommender.loadtest --apps app.py --sessions 50 --steps 30 --think 0.5
+
+Each app runs in a fresh process with an empty temporary index store, as in
+recommender.bench. Inside it every simulated student is a streamlit.testing AppTest session
+driven from its own thread, so sessions share the process's st.cache_resource objects,
+result caches and memory as browser sessions on one Streamlit worker do. Sessions start
+spread over --ramp seconds; each opens the app and performs --steps actions, with
+exponentially distributed think time between them:
+
+    language  switch the interface language (app.py)
+    filters   new location, work mode or domains and minimum stipend, then search
+    query     new skill query, then search
+    upload    a generated CV (app.py) or the generated listings CSV (namira_app)
+    page      next results page, when there is one
+    similar   "More like" on a result card (app.py)
+
+app.py serves a generated SQLite catalog of --size listings (recommender.sqlcatalog);
+namira_app ingests a generated CSV of --size listings the first time a session uploads it.
+The report has rerun latency percentiles overall and per action, failed reruns, an RSS
+timeline sampled every --sample seconds with the sessions open at each point, RSS growth
+per session and after the last session opened, and the session-state bytes each session
+holds on its own (objects reachable from other sessions are counted once, as shared).
+"""
+import argparse
+import json
+import mmap
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from .bench import environment, peak_rss_mb
+
+ROOT = Path(__file__).resolve().parent.parent
+APPS = {'app.py': 'internmate', 'namira_app/app.py': 'namira'}
+ACTIONS = {   # relative frequency of each action after a session opens
+    'internmate': {'language': 1, 'filters': 3, 'query': 4, 'upload': 1, 'page': 2, 'similar': 1},
+    'namira': {'filters': 3, 'query': 4, 'upload': 1, 'page': 2},
+}
+SESSIONS = 10
+STEPS = 20         # actions per session after it opens
+THINK = 1.0        # mean seconds between a session's actions
+RAMP = 10.0        # seconds over which sessions start
+SAMPLE = 0.5       # seconds between RSS samples
+SIZE = 100000
+TIMEOUT = 120.0    # seconds a single rerun may take before it counts as failed
+CV_SKILLS = (3, 8)
+
+
+def current_rss_mb():
+    """Resident set size now, from /proc; the peak where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm', encoding='ascii') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def percentiles(samples):
+    ms = np.asarray(samples) * 1000
+    if not len(ms):
+        return {'runs': 0}
+    return {'runs': len(ms), 'p50_ms': float(np.percentile(ms, 50)), 'p90_ms': float(np.percentile(ms, 90)),
+            'p99_ms': float(np.percentile(ms, 99)), 'max_ms': float(ms.max()), 'mean_ms': float(ms.mean())}
+
+
+def percentiles_mb(sizes):
+    mb = np.asarray(sizes) / (1024 * 1024)
+    if not len(mb):
+        return {}
+    return {'p50': float(np.percentile(mb, 50)), 'max': float(mb.max()), 'total': float(mb.sum())}
+
+
+def prepare(kind, size, seed, workdir):
+    """Generated inputs for `kind`: the catalog (or listings CSV), skill queries and CVs."""
+    from .synthetic import DOMAINS, generate_listings, sample_queries
+
+    listings = generate_listings(size, seed)
+    rng = np.random.default_rng(seed)
+    skills = sorted({skill for _, domain_skills, _ in DOMAINS.values() for skill in domain_skills})
+    fixtures = {'queries': sample_queries(256, seed), 'cvs': [
+        ("Curriculum vitae\nSkills: " + ", ".join(rng.choice(skills, rng.integers(*CV_SKILLS), replace=False))
+         + "\nProjects: coursework and internships using the skills above.\n").encode('utf-8')
+        for _ in range(32)]}
+    if kind == 'internmate':
+        from .sqlcatalog import build_database, listing_chunks
+        from . import store
+
+        path = Path(workdir) / 'catalog.db'
+        build_database(path, listing_chunks(listings), store.content_hash(json.dumps(listings, sort_keys=True, ensure_ascii=False)))
+        fixtures['catalog_db'] = str(path)
+    else:
+        import pandas as pd
+
+        frame = pd.DataFrame({column: listings[column] for column in ('company', 'role', 'location', 'stipend')})
+        frame['description'] = [f"{description} Skills: {skills}."
+                                for description, skills in zip(listings['description'], listings['skills'])]
+        fixtures['csv'] = frame.to_csv(index=False).encode('utf-8')
+    return fixtures
+
+
+def _choose(rng, values):
+    return values[int(rng.integers(len(values)))]
+
+
+def _button(widgets, key):
+    return next((widget for widget in widgets if widget.key == key and not widget.disabled), None)
+
+
+def internmate_action(at, action, fixtures, rng):
+    """Sets up `action` on an app.py session; returns the rerun to time, or None if it does not apply."""
+    from .ui import LANGUAGE_OPTIONS
+
+    sidebar = at.sidebar
+    search = sidebar.button[0]
+    if action == 'language':
+        return at.selectbox(key='language_select_key').select(_choose(rng, list(LANGUAGE_OPTIONS))).run
+    if action == 'filters':
+        location, work_mode = sidebar.selectbox[1], sidebar.selectbox[2]
+        location.select(_choose(rng, location.options) if rng.random() < 0.5 else location.options[0])
+        work_mode.select(_choose(rng, work_mode.options))
+        sidebar.slider[0].set_value(int(_choose(rng, [0, 0, 5000, 10000, 20000])))
+        return search.click().run
+    if action == 'query':
+        sidebar.text_input[0].input(_choose(rng, fixtures['queries']))
+        return search.click().run
+    if action == 'upload':
+        at.file_uploader(key='cv_uploader').set_value(('cv.txt', _choose(rng, fixtures['cvs']), 'text/plain'))
+        return search.click().run
+    if action == 'page':
+        next_page = _button(at.button, 'next_page')
+        return next_page and next_page.click().run
+    if action == 'similar':
+        similar = [button for button in at.button if (button.key or '').startswith('similar_')]
+        return similar and _choose(rng, similar).click().run
+    raise ValueError(f"unknown action {action!r}")
+
+
+def namira_action(at, action, fixtures, rng):
+    """Sets up `action` on a namira_app session; returns the rerun to time, or None if it does not apply."""
+    from .domains import DOMAINS
+
+    sidebar = at.sidebar
+    submit = sidebar.button[0]
+    if action == 'filters':
+        location = sidebar.selectbox[0]
+        location.select(_choose(rng, location.options))
+        sidebar.multiselect[0].set_value([str(domain) for domain in rng.choice(DOMAINS, rng.integers(0, 3), replace=False)])
+        sidebar.slider[0].set_value(int(_choose(rng, [0, 0, 2000, 5000, 10000])))
+        return submit.click().run
+    if action == 'query':
+        sidebar.text_area[0].input(_choose(rng, fixtures['queries']))
+        return submit.click().run
+    if action == 'upload':
+        at.checkbox[0].set_value(bool(rng.random() < 0.5))
+        return at.file_uploader[0].set_value(('listings.csv', fixtures['csv'], 'text/csv')).run
+    if action == 'page':
+        next_page = _button(at.button, 'next_page')
+        return next_page and next_page.click().run
+    raise ValueError(f"unknown action {action!r}")
+
+
+def _share_apptest_state():
+    """Lets AppTest sessions run on several threads of one process.
+
+    AppTest.run assumes it is the only run in the process: it turns testing mode on (by
+    patching config.get_option) and installs a mock Runtime only while it runs, and compiles
+    the script under a lock of its own. Testing mode is kept on, the latest Runtime stays
+    installed for the sessions still running, and every script cache shares one lock, since
+    concurrent compile() calls can fail with "AST constructor recursion depth mismatch".
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    config.set_option('global.appTest', True)
+
+    compiling = threading.Lock()
+    cache_init = ScriptCache.__init__
+
+    def init(cache):
+        cache_init(cache)
+        cache._lock = compiling
+
+    ScriptCache.__init__ = init
+
+    original = Runtime.instance.__func__
+    latest = [None]
+
+    def instance(cls):
+        if cls._instance is not None:
+            latest[0] = cls._instance
+        return original(cls) if latest[0] is None else latest[0]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or latest[0] is not None)
+
+
+def run_session(number, app, kind, fixtures, steps, think, start_at, timeout, seed, samples, opened):
+    """One simulated student: opens `app` at `start_at` and performs `steps` weighted random actions."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = np.random.default_rng([seed, number])
+    drive = internmate_action if kind == 'internmate' else namira_action
+    actions, weights = zip(*ACTIONS[kind].items())
+    weights = np.asarray(weights) / sum(weights)
+
+    def prepare_action(action):
+        """(action performed, rerun): an action that does not apply yet (no next page) becomes a query."""
+        rerun = drive(at, action, fixtures, rng)
+        return (action, rerun) if rerun else ('query', drive(at, 'query', fixtures, rng))
+
+    def timed(action, setup):
+        """Times setup() -> (action, rerun) and the rerun; returns whether both succeeded."""
+        start = time.perf_counter()
+        try:
+            action, rerun = setup()
+            rerun()
+            if at.exception:
+                error = at.exception[0].message
+            elif not at.main.children:
+                error = 'the rerun rendered nothing'   # the script thread died before the app ran
+            else:
+                error = None
+        except Exception as exc:   # a failed setup, timed-out or crashed rerun is a result, not a harness failure
+            error = f"{type(exc).__name__}: {exc}"
+        samples.append((number, action, start, time.perf_counter() - start, error))
+        return error is None
+
+    time.sleep(max(0.0, start_at - time.perf_counter()))
+    at = AppTest.from_file(str(ROOT / app), default_timeout=timeout)
+    ok = timed('open', lambda: ('open', at.run))
+    opened.append(time.perf_counter())
+    for _ in range(steps if ok else 0):
+        time.sleep(rng.exponential(think))
+        action = actions[rng.choice(len(actions), p=weights)]
+        timed(action, lambda: prepare_action(action))
+    return at
+
+
+def _references(value, found):
+    """Adds id -> bytes for `value` and everything it references to `found`, skipping ids already there."""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if id(value) in found or isinstance(value, (type, type(sys), type(len), type(lambda: 0))):
+            continue
+        if isinstance(value, np.ndarray):
+            base = value
+            while isinstance(base, np.ndarray) and base.base is not None:
+                base = base.base
+            # views add nothing of their own; memory-mapped arrays are page cache, not session memory
+            found[id(value)] = 0 if base is not value or isinstance(base, mmap.mmap) else value.nbytes
+            if base is not value:
+                stack.append(base)
+            continue
+        if hasattr(value, 'memory_usage') and hasattr(value, 'index'):   # DataFrame or Series
+            found[id(value)] = int(np.sum(value.memory_usage(deep=True)))
+            continue
+        found[id(value)] = sys.getsizeof(value)
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            stack.extend(value)
+        elif hasattr(value, '__dict__') and not isinstance(value, (str, bytes)):
+            stack.append(vars(value))
+        elif hasattr(value, '__slots__'):
+            stack.extend(getattr(value, slot) for slot in value.__slots__ if hasattr(value, slot))
+
+
+def session_footprint(states):
+    """(bytes each session holds alone, bytes reachable from more than one session)."""
+    per_session = []
+    for state in states:
+        found = {}
+        _references(state, found)
+        per_session.append(found)
+    holders = Counter(object_id for found in per_session for object_id in found)
+    shared = {}
+    for found in per_session:
+        shared.update((object_id, size) for object_id, size in found.items() if holders[object_id] > 1)
+    own = [sum(size for object_id, size in found.items() if holders[object_id] == 1) for found in per_session]
+    return own, sum(shared.values())
+
+
+def run_app(app, sessions, steps, think, ramp, size, sample, timeout, seed):
+    """Load-test record for one app; call in a fresh process with an empty store."""
+    from streamlit import logger
+
+    kind = APPS[app]
+    logger.set_log_level('error')   # the apps' unlabelled widgets warn on every rerun
+    _share_apptest_state()
+    with tempfile.TemporaryDirectory(prefix='internmate-load-') as workdir:
+        start = time.perf_counter()
+        fixtures = prepare(kind, size, seed, workdir)
+        prepare_seconds = time.perf_counter() - start
+        if 'catalog_db' in fixtures:
+            os.environ['INTERNMATE_CATALOG_DB'] = fixtures['catalog_db']
+
+        samples, opened, timeline = [], [], []
+        stop = threading.Event()
+        began = time.perf_counter()
+        rss_start = current_rss_mb()
+
+        def sample_rss():
+            while True:
+                timeline.append({'t': time.perf_counter() - began, 'rss_mb': current_rss_mb(), 'sessions': len(opened)})
+                if stop.wait(sample):
+                    break
+
+        sampler = threading.Thread(target=sample_rss, name='rss-sampler', daemon=True)
+        sampler.start()
+        apps = [None] * sessions
+
+        def session(number):
+            apps[number] = run_session(number, app, kind, fixtures, steps, think, began + ramp * number / max(sessions, 1),
+                                       timeout, seed, samples, opened)
+
+        threads = [threading.Thread(target=session, args=(number,), name=f'session-{number}') for number in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - began
+        stop.set()
+        sampler.join()
+        rss_end = current_rss_mb()
+        own, shared = session_footprint([at.session_state.to_dict() for at in apps if at is not None])
+
+    last_open = max(opened) - began if opened else 0.0
+    rss_after_open = next((point['rss_mb'] for point in timeline if point['t'] >= last_open), rss_end)
+    errors = Counter(error.splitlines()[0][:200] for _, _, _, _, error in samples if error)
+    by_action = {}
+    for _, action, _, seconds, error in samples:
+        if error is None:
+            by_action.setdefault(action, []).append(seconds)
+    return {
+        'app': app, 'size': size, 'sessions': sessions, 'steps': steps, 'think_s': think, 'ramp_s': ramp, 'seed': seed,
+        'prepare_s': prepare_seconds, 'duration_s': duration, 'reruns': len(samples),
+        'reruns_per_s': len(samples) / duration if duration else None, 'failed': sum(errors.values()),
+        'errors': dict(errors.most_common(5)),
+        'latency': percentiles([seconds for _, _, _, seconds, error in samples if error is None]),
+        'latency_by_action': {action: percentiles(seconds) for action, seconds in sorted(by_action.items())},
+        'rss': {'start_mb': rss_start, 'end_mb': rss_end, 'peak_mb': peak_rss_mb(),
+                'growth_per_session_mb': (rss_end - rss_start) / max(len(opened), 1),
+                'growth_after_open_mb': rss_end - rss_after_open},
+        'session_state': {'own_mb': percentiles_mb(own), 'shared_mb': shared / (1024 * 1024)},
+        'timeline': timeline,
+    }
+
+
+def run_isolated(app, args):
+    """Runs one app's load test in a child process with its own temporary index store."""
+    with tempfile.TemporaryDirectory(prefix='internmate-load-store-') as store_dir:
+        completed = subprocess.run(
+            [sys.executable, '-m', 'recommender.loadtest', '--single', app, '--sessions', str(args.sessions),
+             '--steps', str(args.steps), '--think', str(args.think), '--ramp', str(args.ramp), '--size', str(args.size),
+             '--sample', str(args.sample), '--timeout', str(args.timeout), '--seed', str(args.seed)],
+            cwd=ROOT, env={**os.environ, 'INTERNMATE_INDEX_DIR': store_dir}, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"load test of {app} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m recommender.loadtest', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--apps', nargs='+', choices=list(APPS), default=list(APPS), help="apps to load, each in its own process")
+    parser.add_argument('--sessions', type=int, default=SESSIONS, help=f"simulated students per app (default {SESSIONS})")
+    parser.add_argument('--steps', type=int, default=STEPS, help=f"actions per session after opening (default {STEPS})")
+    parser.add_argument('--think', type=float, default=THINK, help=f"mean seconds between actions (default {THINK})")
+    parser.add_argument('--ramp', type=float, default=RAMP, help=f"seconds over which sessions start (default {RAMP})")
+    parser.add_argument('--size', type=int, default=SIZE, help=f"generated listings (default {SIZE:,})")
+    parser.add_argument('--sample', type=float, default=SAMPLE, help=f"seconds between RSS samples (default {SAMPLE})")
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help=f"seconds before a rerun fails (default {TIMEOUT:.0f})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='-', help="JSON report path, or '-' for stdout (default)")
+    parser.add_argument('--single', choices=list(APPS), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single is not None:
+        json.dump(run_app(args.single, args.sessions, args.steps, args.think, args.ramp, args.size, args.sample,
+                          args.timeout, args.seed), sys.stdout)
+        return 0
+
+    report = {'environment': environment(), 'runs': []}
+    for app in args.apps:
+        run = run_isolated(app, args)
+        report['runs'].append(run)
+        latency, rss = run['latency'], run['rss']
+        print(f"{app}: {run['sessions']} sessions, {run['reruns']:,} reruns ({run['failed']} failed) in {run['duration_s']:.0f} s  "
+              f"rerun p50 {latency.get('p50_ms', 0):.0f} ms p99 {latency.get('p99_ms', 0):.0f} ms  "
+              f"RSS {rss['start_mb']:,.0f} -> {rss['end_mb']:,.0f} MiB ({rss['growth_per_session_mb']:.1f} MiB/session, "
+              f"{rss['growth_after_open_mb']:+.1f} MiB after the last session opened)", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        Path(args.output).write_text(text + "\n", encoding='utf-8')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Dense LSA embeddings with an IVF-style approximate nearest-neighbour index.
+
+    python -m recommender.lsa --size 100000 --probes 1 4 8 16 -k 50
+
+TF-IDF rows are projected with truncated SVD into `dims` dimensions, L2-normalised and kept
+as float32. Spherical k-means splits them into `lists` inverted lists stored contiguously;
+a query is projected the same way and the `n_probe` lists whose centroids are closest are
+scanned, widening to further lists (closest first) while they hold too few listings that pass
+the filter mask to fill the rerank pool. A mask no larger than n_probe average lists is
+scored exactly instead: that is no more work than probing, and selective filters (one city,
+offline only) would otherwise starve the probed lists. With rerank (the default) the best k * RERANK_FACTOR dense candidates are
+re-scored with the exact sparse TF-IDF cosine, so returned scores match the exact path.
+Everything runs in-process on the CPU and is persisted per catalog version in the store.
+
+The CLI reports recall@K of the approximate path against exact search, with latencies, for
+each probe count, unfiltered and under filters of decreasing selectivity, so the
+speed/quality trade-off can be chosen per catalog size.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from . import store
+from .ranking import top_k
+
+DIMS = 128             # latent dimensions; float32 embeddings cost 4 * DIMS bytes per listing
+N_PROBE = 8            # inverted lists scanned per query
+RERANK_FACTOR = 4      # dense candidates re-scored exactly per requested result
+TRAIN_PER_LIST = 256   # k-means sample size per list; bounds training time on large catalogs
+ASSIGN_BLOCK = 65536   # rows projected / assigned to lists per matrix product
+
+
+def default_lists(rows):
+    """About sqrt(rows) inverted lists, the usual IVF balance between probe and scan cost."""
+    return int(min(max(np.sqrt(rows), 1), 4096))
+
+
+class LsaIndex:
+    """IVF over LSA embeddings of a TfidfIndex; `order` lists rows grouped by inverted list."""
+
+    def __init__(self, tfidf, components, centroids, offsets, order, embeddings):
+        self.tfidf = tfidf
+        self.components = components    # (dims, terms) float32: the SVD projection
+        self.centroids = centroids      # (lists, dims) float32, unit length
+        self.offsets = offsets          # list l holds order[offsets[l]:offsets[l + 1]]
+        self.order = order              # row ids grouped by list
+        self.embeddings = embeddings    # (rows, dims) float32, in `order`
+
+    @classmethod
+    def build(cls, tfidf, version, dims=DIMS, lists=None, seed=0):
+        """Loads the stored index for this catalog version and shape, or trains and stores it."""
+        vectors = tfidf.catalog_vectors
+        rows, terms = vectors.shape
+        dims = max(1, min(dims, rows - 1, terms - 1))
+        lists = max(1, min(lists or default_lists(rows), rows))
+        key = f"lsa-{version}-d{dims}-l{lists}-s{seed}"
+        stored = store.load(key)
+        if stored is None:
+            cls._train(key, vectors, dims, lists, seed)
+            # serve the memory-mapped copy, shared with every process, not the arrays training produced
+            stored = store.load(key)
+        arrays = stored['arrays']
+        return cls(tfidf, arrays['components'], arrays['centroids'], arrays['offsets'], arrays['order'],
+                   arrays['embeddings'])
+
+    @staticmethod
+    def _train(key, vectors, dims, lists, seed):
+        """Fits the projection and inverted lists for `vectors` and stores them under `key`."""
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.decomposition import TruncatedSVD
+
+        rows = vectors.shape[0]
+        svd = TruncatedSVD(dims, random_state=seed).fit(vectors)
+        components = svd.components_.astype(np.float32)
+        embeddings = np.vstack([_unit_rows(np.asarray(vectors[start:start + ASSIGN_BLOCK] @ components.T, dtype=np.float32))
+                                for start in range(0, rows, ASSIGN_BLOCK)])
+
+        rng = np.random.default_rng(seed)
+        sample = embeddings[rng.choice(rows, min(rows, lists * TRAIN_PER_LIST), replace=False)]
+        kmeans = MiniBatchKMeans(lists, random_state=seed, n_init=3, batch_size=4096).fit(sample)
+        centroids = _unit_rows(kmeans.cluster_centers_.astype(np.float32))
+        assignment = np.concatenate([np.argmax(embeddings[start:start + ASSIGN_BLOCK] @ centroids.T, axis=1)
+                                     for start in range(0, rows, ASSIGN_BLOCK)])
+        order = np.argsort(assignment, kind='stable').astype(np.int32)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=lists))]).astype(np.int64)
+        embeddings = np.ascontiguousarray(embeddings[order])
+
+        arrays = {'components': components, 'centroids': centroids, 'offsets': offsets, 'order': order,
+                  'embeddings': embeddings}
+        store.save(key, arrays=arrays, meta={'dims': dims, 'lists': lists,
+                                             'explained_variance': float(svd.explained_variance_ratio_.sum())})
+
+    def embed(self, text):
+        """(unit float32 query embedding, sparse TF-IDF query vector)."""
+        query_vector = self.tfidf.transform(text)
+        embedding = np.asarray(query_vector @ self.components.T, dtype=np.float32).ravel()
+        norm = np.linalg.norm(embedding)
+        return (embedding / norm if norm else embedding), query_vector
+
+    def search(self, text, mask, k, min_score, n_probe=N_PROBE, rerank=True):
+        """Approximate top k (rows, scores) among the listings in `mask`.
+
+        Scans at least `n_probe` lists, doubling the lists scanned until they hold a full pool
+        (k * RERANK_FACTOR with rerank, else k) of listings in the mask; masks no larger than
+        n_probe average lists are scored exactly.
+        """
+        embedding, query_vector = self.embed(text)
+        if not query_vector.nnz:
+            return np.array([], dtype=int), np.array([])
+        selected = np.count_nonzero(mask)
+        if selected <= n_probe * len(self.order) / len(self.centroids):
+            rows = np.flatnonzero(mask)
+            return self._best(rows, (self.tfidf.catalog_vectors[rows] @ query_vector.T).toarray().ravel(), k, min_score)
+
+        pool_size = k * RERANK_FACTOR if rerank else k
+        ranked_lists = np.argsort(-(self.centroids @ embedding)).tolist()
+        row_parts, score_parts, found, probed, step = [], [], 0, 0, n_probe
+        while found < min(pool_size, selected) and probed < len(ranked_lists):
+            for lst in ranked_lists[probed:probed + step]:
+                start, end = self.offsets[lst], self.offsets[lst + 1]
+                keep = mask[self.order[start:end]]
+                row_parts.append(self.order[start:end][keep])
+                score_parts.append(self.embeddings[start:end][keep] @ embedding)
+                found += len(row_parts[-1])
+            probed += step
+            step = probed   # double the lists scanned
+        rows, scores = np.concatenate(row_parts), np.concatenate(score_parts)
+
+        if rerank:
+            pool = top_k(scores, pool_size)
+            rows = rows[pool]
+            scores = (self.tfidf.catalog_vectors[rows] @ query_vector.T).toarray().ravel()
+        return self._best(rows, scores, k, min_score)
+
+    @staticmethod
+    def _best(rows, scores, k, min_score):
+        keep = scores > min_score
+        rows, scores = rows[keep], scores[keep]
+        best = top_k(scores, k)
+        return rows[best], scores[best]
+
+
+def _unit_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def evaluate(tfidf, ann, queries, k, probes, rerank=True, filters=None):
+    """recall@k of the approximate path against exact search, with p50/p99 latencies, per filter and probe count.
+
+    `filters` maps a name to a row mask (default: one unfiltered mask). Recall is tie-aware: an
+    approximate result counts as a hit when its exact score reaches the k-th exact score, since
+    listings tied at the cut-off are equally correct answers. mean_results is the average
+    number of listings returned, against exact search's in exact_mean_results.
+    """
+    if filters is None:
+        filters = {'any': np.ones(tfidf.catalog_vectors.shape[0], dtype=bool)}
+    report = []
+    for name, mask in filters.items():
+        truths, exact_seconds = [], []
+        for text in queries:
+            start = time.perf_counter()
+            rows, scores = tfidf.search(text, mask, k, 0.0)
+            exact_seconds.append(time.perf_counter() - start)
+            truths.append((len(rows), scores[-1] - 1e-9 if len(rows) else None, tfidf.transform(text)))
+
+        for n_probe in probes:
+            recalls, seconds, returned = [], [], []
+            for text, (count, cutoff, query_vector) in zip(queries, truths):
+                start = time.perf_counter()
+                rows, _ = ann.search(text, mask, k, 0.0, n_probe=n_probe, rerank=rerank)
+                seconds.append(time.perf_counter() - start)
+                returned.append(len(rows))
+                if count:
+                    exact_scores = (tfidf.catalog_vectors[rows] @ query_vector.T).toarray().ravel()
+                    recalls.append(min(int((exact_scores >= cutoff).sum()), count) / count)
+            report.append({
+                'filter': name, 'listings': int(mask.sum()), 'n_probe': n_probe, 'rerank': rerank,
+                f'recall_at_{k}': float(np.mean(recalls)) if recalls else None,
+                'mean_results': float(np.mean(returned)), 'exact_mean_results': float(np.mean([t[0] for t in truths])),
+                'p50_ms': float(np.percentile(seconds, 50) * 1000), 'p99_ms': float(np.percentile(seconds, 99) * 1000),
+                'exact_p50_ms': float(np.percentile(exact_seconds, 50) * 1000),
+                'exact_p99_ms': float(np.percentile(exact_seconds, 99) * 1000),
+            })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m recommender.lsa', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=100000, help="synthetic listings; 0 uses the built-in catalog")
+    parser.add_argument('--dims', type=int, default=DIMS, help=f"latent dimensions (default {DIMS})")
+    parser.add_argument('--lists', type=int, default=0, help="inverted lists; 0 picks about sqrt(listings)")
+    parser.add_argument('--probes', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32], help="probe counts to report")
+    parser.add_argument('-k', '--top-k', type=int, default=50)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--no-rerank', action='store_true', help="rank by dense score only")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from .catalog import load_catalog
+    from .engine import Recommender
+    from .synthetic import generate_listings, sample_queries
+
+    catalog = load_catalog(generate_listings(args.size, args.seed) if args.size else None)
+    engine = Recommender(catalog)
+    tfidf = engine.index
+    city = catalog['city'].value_counts().index[0]
+    # unfiltered, then the app's filters from broad to selective
+    filters = {'any': engine.mask(), 'Online': engine.mask('Online'),
+               f'Offline+{city}': engine.mask('Offline', city)}
+    start = time.perf_counter()
+    ann = LsaIndex.build(tfidf, catalog.attrs['version'], args.dims, args.lists or None, args.seed)
+    print(f"{len(catalog):,} listings, {ann.embeddings.shape[1]} dims, {len(ann.centroids)} lists, "
+          f"index ready in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    for row in evaluate(tfidf, ann, sample_queries(args.queries, args.seed), args.top_k, args.probes, not args.no_rerank,
+                        filters):
+        print(json.dumps(row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""Per-session memos for pipeline stages, so a rerun recomputes only the stages whose inputs changed.
+
+A StageMemo keeps the last (key, value) of each named stage: changing a filter re-runs the
+filter and ranking stages but reuses the query's scores, and a rerun that changes nothing
+downstream of the ranking reuses the ranking. One entry per stage bounds the memory a
+session holds to one result of each stage. NO_MEMO computes every stage every time.
+"""
+
+
+class StageMemo:
+    def __init__(self):
+        self.entries = {}   # stage -> (key, value)
+        self.hits = self.misses = 0
+
+    def get(self, stage, key, compute):
+        """The value of `stage` for `key`, calling compute() only if the last key was different."""
+        entry = self.entries.get(stage)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = compute()
+        self.entries[stage] = (key, value)
+        return value
+
+
+class _NoMemo:
+    def get(self, stage, key, compute):
+        return compute()
+
+
+NO_MEMO = _NoMemo()
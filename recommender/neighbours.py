@@ -0,0 +1,273 @@
+"""Precomputed "more like this" graph: each listing's top K most similar listings.
+
+    python -m recommender.neighbours --build                       # store the built-in catalog's graph
+    python -m recommender.neighbours --size 20000 -k 10 --change 100
+
+Building is minutes per 100k listings, so it happens offline (--build) or when an engine is
+created (Recommender.build_neighbour_graph); requests only map the stored graph.
+
+TF-IDF rows are L2-normalised, so similarity is a dot product and the graph comes from
+blocked sparse products vectors[block] @ vectors.T: each block of listings is scored against
+the whole catalog, its self-similarity dropped and its top K kept, so memory is bounded by
+one block (BLOCK_CELLS scores) whatever the catalog size. The graph is two (listings, K)
+arrays, int32 neighbour rows (-1 pads a listing with fewer than K similar listings) and
+float32 scores, stored per catalog version; a lookup is one row slice, O(K).
+
+update() carries a graph over to a new catalog version without a full pass. Listings are
+matched by their indexed text; new or edited listings are scored against the catalog in one
+blocked pass, which also gives every other listing its best matches among them. Unchanged
+listings re-score their stored neighbours against the new vectors (a refit shifts IDF) and
+merge in those matches; listings that lost a stored neighbour to an edit or removal are
+recomputed in full. A neighbour that overtakes one purely through the IDF shift is the only
+difference from a rebuild. The CLI reports both against each other.
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from . import store
+
+NEIGHBOURS = 10          # similar listings kept per listing
+BLOCK_CELLS = 2 ** 22    # scores held per block product (32 MB as float64)
+PAIR_BLOCK = 2 ** 16     # (listing, neighbour) pairs re-scored per sparse product
+
+
+def _block_rows(rows):
+    return max(1, BLOCK_CELLS // max(rows, 1))
+
+
+def _ordered(rows, scores, k):
+    """Top k per row of (n, m) candidate arrays, best first, ties by row id; non-positive scores become -1 / 0."""
+    if rows.shape[1] > k:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        rows, scores = np.take_along_axis(rows, part, axis=1), np.take_along_axis(scores, part, axis=1)
+    order = np.lexsort((rows, -scores), axis=1)
+    rows, scores = np.take_along_axis(rows, order, axis=1), np.take_along_axis(scores, order, axis=1)
+    missing = scores <= 0
+    rows[missing], scores[missing] = -1, 0
+    if rows.shape[1] < k:
+        pad = k - rows.shape[1]
+        rows = np.pad(rows, ((0, 0), (0, pad)), constant_values=-1)
+        scores = np.pad(scores, ((0, 0), (0, pad)))
+    return rows.astype(np.int32), scores.astype(np.float32)
+
+
+def _scan(vectors, selected, k, columns=False):
+    """Top k neighbours of each `selected` row, by blocked products against every row.
+
+    With columns=True, also the top k of the selected rows for every row of the catalog
+    (what each listing gains from them), taken from the same products.
+    """
+    total = vectors.shape[0]
+    rows = np.empty((len(selected), k), dtype=np.int32)
+    scores = np.empty((len(selected), k), dtype=np.float32)
+    best_rows = np.full((k, total), -1, dtype=np.int32) if columns else None
+    best_scores = np.zeros((k, total)) if columns else None
+    step = _block_rows(total)
+    for start in range(0, len(selected), step):
+        block = selected[start:start + step]
+        similarity = (vectors[block] @ vectors.T).toarray()
+        similarity[np.arange(len(block)), block] = 0
+        candidates = np.broadcast_to(np.arange(total, dtype=np.int32), similarity.shape)
+        rows[start:start + step], scores[start:start + step] = _ordered(candidates, similarity, k)
+        if columns:
+            stacked_rows = np.vstack([best_rows, np.broadcast_to(block.astype(np.int32)[:, None], similarity.shape)])
+            stacked_scores = np.vstack([best_scores, similarity])
+            keep = np.argpartition(-stacked_scores, k - 1, axis=0)[:k]
+            best_rows = np.take_along_axis(stacked_rows, keep, axis=0)
+            best_scores = np.take_along_axis(stacked_scores, keep, axis=0)
+    return rows, scores, best_rows, best_scores
+
+
+def _pair_scores(vectors, left, right):
+    """Similarity of vectors[left[i]] and vectors[right[i]] for every i."""
+    scores = np.empty(len(left))
+    for start in range(0, len(left), PAIR_BLOCK):
+        end = start + PAIR_BLOCK
+        scores[start:end] = np.asarray(vectors[left[start:end]].multiply(vectors[right[start:end]]).sum(axis=1)).ravel()
+    return scores
+
+
+def match_rows(old_texts, new_texts):
+    """(row_map, changed): each old row's new row (-1 if edited or removed), and the new rows with no old match."""
+    unmatched = {}
+    for row, text in enumerate(old_texts):
+        unmatched.setdefault(text, []).append(row)
+    row_map = np.full(len(old_texts), -1, dtype=np.int64)
+    changed = []
+    for row, text in enumerate(new_texts):
+        rows = unmatched.get(text)
+        if rows:
+            row_map[rows.pop(0)] = row
+        else:
+            changed.append(row)
+    return row_map, np.array(changed, dtype=np.int64)
+
+
+class NeighbourGraph:
+    """Top K similar listings per listing: `rows` (int32, -1 padded) and `scores` (float32), best first."""
+
+    def __init__(self, rows, scores, recomputed=None):
+        self.rows = rows
+        self.scores = scores
+        self.recomputed = recomputed   # listings update() scored in full, for reporting
+
+    @property
+    def k(self):
+        return self.rows.shape[1]
+
+    @classmethod
+    def compute(cls, vectors, k=NEIGHBOURS):
+        """The graph of L2-normalised row `vectors`, from blocked products over the whole catalog."""
+        rows, scores, _, _ = _scan(vectors, np.arange(vectors.shape[0]), k)
+        return cls(rows, scores)
+
+    def update(self, vectors, row_map, changed):
+        """The graph for new `vectors`, given match_rows() of the old catalog's texts to the new ones."""
+        k, total = self.k, vectors.shape[0]
+        rows = np.full((total, k), -1, dtype=np.int32)
+        scores = np.zeros((total, k), dtype=np.float32)
+        kept = np.flatnonzero(row_map >= 0)
+        unchanged = row_map[kept]
+
+        # stored neighbours in new row ids; a listing whose neighbour was edited or removed is recomputed
+        carried = np.where(self.rows[kept] >= 0, row_map[np.maximum(self.rows[kept], 0)], -2)
+        dirty = (carried == -1).any(axis=1)
+        recompute = np.concatenate([changed, unchanged[dirty]])
+
+        changed_rows, changed_scores, gained_rows, gained_scores = _scan(vectors, changed, k, columns=True)
+        rows[changed], scores[changed] = changed_rows, changed_scores
+        rows[unchanged[dirty]], scores[unchanged[dirty]], _, _ = _scan(vectors, unchanged[dirty], k)
+
+        keep, targets = carried[~dirty], unchanged[~dirty]
+        valid = keep >= 0
+        rescored = np.zeros(keep.shape)
+        pair_rows = np.broadcast_to(targets[:, None], keep.shape)[valid]
+        rescored[valid] = _pair_scores(vectors, pair_rows, keep[valid])
+        rows[targets], scores[targets] = _ordered(
+            np.hstack([np.where(valid, keep, -1), gained_rows[:, targets].T]),
+            np.hstack([rescored, gained_scores[:, targets].T]), k)
+        return type(self)(rows, scores, len(recompute))
+
+    def similar(self, row, k=None):
+        """The listings most like `row`, as (rows, scores), best first."""
+        rows, scores = self.rows[row, :k], self.scores[row, :k]
+        found = rows >= 0
+        return rows[found].astype(int), scores[found].astype(float)
+
+    def save(self, key, meta=None):
+        store.save(key, arrays={'rows': self.rows, 'scores': self.scores}, meta=meta)
+
+    @classmethod
+    def load(cls, key):
+        stored = store.load(key)
+        return None if stored is None else cls(stored['arrays']['rows'], stored['arrays']['scores'])
+
+
+def listing_texts(catalog):
+    """The indexed text of each listing, as recommender.tfidf combines it; identifies unchanged listings."""
+    return (catalog['skills'] + " " + catalog['description']).tolist()
+
+
+def graph_key(catalog, k=NEIGHBOURS):
+    return f"neighbours-{catalog.attrs['version']}-k{k}"
+
+
+def stored_graph(catalog, k=NEIGHBOURS):
+    """The stored graph for `catalog`'s version, memory-mapped, or None when it has not been built."""
+    return NeighbourGraph.load(graph_key(catalog, k))
+
+
+def neighbour_graph(tfidf, catalog, k=NEIGHBOURS, previous=None):
+    """The stored graph for `catalog`'s version, or a new one, updated from the stored graph of the
+    `previous` catalog when there is one and computed in full otherwise."""
+    key = graph_key(catalog, k)
+    graph = NeighbourGraph.load(key)
+    if graph is not None:
+        return graph
+    old = None if previous is None else stored_graph(previous, k)
+    start = time.perf_counter()
+    if old is None:
+        graph = NeighbourGraph.compute(tfidf.catalog_vectors, k)
+        meta = {'built_from': None}
+    else:
+        row_map, changed = match_rows(listing_texts(previous), listing_texts(catalog))
+        graph = old.update(tfidf.catalog_vectors, row_map, changed)
+        meta = {'built_from': previous.attrs['version'], 'changed': len(changed), 'recomputed': graph.recomputed}
+    graph.save(key, {**meta, 'seconds': time.perf_counter() - start})
+    return NeighbourGraph.load(key)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m recommender.neighbours', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, help="synthetic listings; 0 uses the built-in catalog "
+                                                 "(default 20000, or the built-in catalog with --build)")
+    parser.add_argument('-k', '--neighbours', type=int, default=NEIGHBOURS)
+    parser.add_argument('--change', type=int, default=100, help="listings edited, and as many added, before the update")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--build', action='store_true',
+                        help="store the graph of the catalog (built-in unless --size is given) for engines to map, and exit")
+    args = parser.parse_args(argv)
+
+    from .catalog import BUILTIN_LISTINGS, load_catalog
+    from .synthetic import generate_listings
+    from .tfidf import TfidfIndex
+
+    if args.build:
+        catalog = load_catalog(generate_listings(args.size, args.seed) if args.size else None)
+        start = time.perf_counter()
+        graph = neighbour_graph(TfidfIndex.build(catalog), catalog, args.neighbours)
+        print(f"{len(catalog):,} listings: graph {graph_key(catalog, args.neighbours)} ready in "
+              f"{time.perf_counter() - start:.1f} s", file=sys.stderr)
+        return
+
+    size = 20000 if args.size is None else args.size
+    listings = generate_listings(size, args.seed) if size else BUILTIN_LISTINGS
+    before = load_catalog(listings)
+    before_vectors = TfidfIndex.build(before).catalog_vectors
+    start = time.perf_counter()
+    graph = NeighbourGraph.compute(before_vectors, args.neighbours)
+    build_seconds = time.perf_counter() - start
+    graph.save(graph_key(before, args.neighbours))
+
+    rng = np.random.default_rng(args.seed)
+    changes = min(args.change, len(before))
+    fresh = generate_listings(2 * changes, args.seed + 1)
+    edited = rng.choice(len(before), changes, replace=False)
+    after_listings = {column: list(values) for column, values in listings.items()}
+    for column, values in after_listings.items():
+        for position, row in enumerate(edited.tolist()):
+            values[row] = fresh[column][position]
+        values.extend(fresh[column][changes:])
+    after = load_catalog(after_listings)
+    after_vectors = TfidfIndex.build(after).catalog_vectors
+
+    start = time.perf_counter()
+    row_map, changed = match_rows(listing_texts(before), listing_texts(after))
+    updated = graph.update(after_vectors, row_map, changed)
+    update_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    rebuilt = NeighbourGraph.compute(after_vectors, args.neighbours)
+    rebuild_seconds = time.perf_counter() - start
+
+    lookups = rng.integers(0, len(after), 1000)
+    start = time.perf_counter()
+    for row in lookups.tolist():
+        updated.similar(row)
+    lookup_seconds = (time.perf_counter() - start) / len(lookups)
+    print(f"{len(before):,} listings, {changes:,} edited and {changes:,} added, "
+          f"{graph.rows.nbytes + graph.scores.nbytes:,} bytes of graph", file=sys.stderr)
+    print(json.dumps({
+        'neighbours': args.neighbours, 'build_s': build_seconds, 'update_s': update_seconds, 'rebuild_s': rebuild_seconds,
+        'recomputed': updated.recomputed, 'lookup_us': lookup_seconds * 1e6,
+        'rows_equal': float((updated.rows == rebuilt.rows).all(axis=1).mean()),
+        'scores_close': float(np.isclose(updated.scores, rebuilt.scores, atol=1e-5).all(axis=1).mean()),
+        'max_score_gap': float((rebuilt.scores - updated.scores).max()),
+    }))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Top-K selection and inverted-index scoring shared by every index type."""
+import numpy as np
+
+
+def top_k(values, k):
+    """Positions of the k largest values, best first, using partial selection instead of a full sort."""
+    top = np.argpartition(-values, k - 1)[:k] if len(values) > k else np.arange(len(values))
+    return top[np.argsort(-values[top], kind='stable')]
+
+
+def score_postings(inverted, query_vector):
+    """Scores only the listings that share a term with the query; returns (candidate rows, scores).
+
+    `inverted` is the column-major (CSC) copy of L2-normalised TF-IDF rows, so summing the
+    per-term weight products gives the cosine similarity.
+    """
+    postings = [(inverted.indptr[term], inverted.indptr[term + 1], weight)
+                for term, weight in zip(query_vector.indices, query_vector.data)]
+    if not postings:
+        return np.array([], dtype=int), np.array([])
+    rows = np.concatenate([inverted.indices[start:end] for start, end, _ in postings])
+    weights = np.concatenate([inverted.data[start:end] * weight for start, end, weight in postings])
+    candidates, slots = np.unique(rows, return_inverse=True)
+    return candidates, np.bincount(slots, weights=weights)
+
+
+def search_postings(inverted, query_vector, mask, k, min_score):
+    """Top k (rows, scores) among the candidates in `mask` scoring strictly above `min_score`."""
+    return select_candidates(*score_postings(inverted, query_vector), mask, k, min_score)
+
+
+def select_candidates(candidates, scores, mask, k, min_score):
+    """Top k of scored candidates (from score_postings) that are in `mask` and score above `min_score`."""
+    keep = mask[candidates] & (scores > min_score)
+    candidates, scores = candidates[keep], scores[keep]
+    best = top_k(scores, k)
+    return candidates[best], scores[best]
@@ -0,0 +1,49 @@
+"""Resume parsing: bounded text extraction and catalog-skill matching."""
+import io
+import re
+import time
+import unicodedata
+
+MAX_CV_PAGES = 20       # PDF pages read before extraction stops
+CV_TIME_BUDGET = 3.0    # Seconds of PDF extraction allowed per resume
+
+
+def extract_resume_text(data, file_type, max_pages=MAX_CV_PAGES, time_budget=CV_TIME_BUDGET):
+    """Extracts normalised text from PDF/TXT resume bytes; returns '' for an unreadable PDF.
+
+    PDF pages are read one at a time and only the first `max_pages` are read, so a very long
+    CV cannot stall the worker. `time_budget` seconds is checked between pages: no page is
+    started after it runs out, but the page being extracted is finished, so a single slow page
+    can still overrun it.
+    """
+    if file_type == 'pdf':
+        try:
+            from pypdf import PdfReader
+            reader = PdfReader(io.BytesIO(data))
+            deadline = time.monotonic() + time_budget
+            pages = []
+            for page in reader.pages[:max_pages]:
+                if time.monotonic() > deadline:
+                    break
+                pages.append(page.extract_text() or '')
+            text = "\n".join(pages)
+        except Exception:
+            return ''
+    else:
+        text = data.decode('utf-8', errors='replace')
+    return " ".join(unicodedata.normalize('NFKC', text).lower().split())
+
+
+def build_skill_matcher(skill_lists):
+    """One compiled pattern over every distinct skill in the comma-separated `skill_lists`.
+
+    Longest skills come first so phrases win over their words.
+    """
+    skills = {skill.strip().lower() for skill_list in skill_lists for skill in skill_list.split(',') if skill.strip()}
+    pattern = "|".join(re.escape(skill) for skill in sorted(skills, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{pattern})(?!\w)")
+
+
+def resume_skill_profile(text, matcher):
+    """Distinct catalog skills mentioned in the resume text, in order of first mention."""
+    return list(dict.fromkeys(matcher.findall(text)))
@@ -0,0 +1,262 @@
+"""Async HTTP/JSON recommendation service with micro-batching.
+
+    python -m recommender.service --port 8080
+
+POST /recommend with a profile object (same fields as a recommender.batch input line, plus
+optional integer "k", clamped to 1..MAX_K, and "timeout_ms") returns {"id", "results": [{row, company, role, score}]}.
+GET /healthz reports queue depth and batching counters.
+
+Requests arriving within --batch-wait-ms of each other are scored together as one sparse
+matrix product in a worker thread, so the event loop keeps accepting connections while a
+batch runs. At most --workers batches are handed to the executor at once; later requests wait
+in the batcher's queue. Each request carries a deadline (504 once it passes, and expired
+requests are dropped both when a batch is formed and again when its job starts). Admission is
+bounded by --max-pending, counting a request until its batch has finished or dropped it, not
+just until it was answered: beyond it new requests get 503 with Retry-After instead of
+joining an ever-growing queue.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from .batch import normalize_profile, recommend_block
+from .engine import MIN_SCORE, TOP_K, Recommender
+
+MAX_BATCH = 64             # requests scored per sparse product
+BATCH_WAIT = 0.005         # seconds the first request of a batch waits for company
+MAX_PENDING = 1024         # admitted requests not yet scored or dropped before new ones get 503
+MAX_IN_FLIGHT = 2          # batches queued or scoring in the executor at once
+DEFAULT_TIMEOUT = 1.0      # seconds a request may take when it sets no timeout_ms
+MAX_TIMEOUT = 10.0         # upper bound on a client-supplied timeout_ms
+MAX_K = 500                # upper bound on a client-supplied k
+MAX_BODY_BYTES = 64 * 1024
+IDLE_TIMEOUT = 30.0        # seconds a keep-alive connection may sit idle
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable',
+           504: 'Gateway Timeout'}
+
+
+class Overloaded(Exception):
+    """The admission queue is full."""
+
+
+class MicroBatcher:
+    """Collects concurrent requests into batches scored off the event loop by recommend_block."""
+
+    def __init__(self, engine, executor, max_batch=MAX_BATCH, max_wait=BATCH_WAIT, max_pending=MAX_PENDING,
+                 min_score=MIN_SCORE, max_in_flight=MAX_IN_FLIGHT):
+        self.engine, self.executor = engine, executor
+        self.max_batch, self.max_wait, self.max_pending, self.min_score = max_batch, max_wait, max_pending, min_score
+        self.max_in_flight = max_in_flight
+        self.queue = []   # (profile, k, deadline, future) waiting for the next flush
+        self.pending = 0     # requests holding a slot: queued, or in a batch that has not finished
+        self.in_flight = 0   # batches handed to the executor and not finished
+        self.batches = self.batched = self.rejected = self.expired = 0
+        self._timer = None
+        self._tasks = set()
+
+    async def recommend(self, profile, k, deadline):
+        """Ranked record for one profile; raises Overloaded, or TimeoutError once `deadline` (loop time) passes.
+
+        The request's slot is released by the batcher, not here: a request that times out
+        keeps it until its entry is dropped or its batch finishes.
+        """
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise Overloaded()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending += 1
+        self.queue.append((profile, k, deadline, future))
+        if len(self.queue) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        try:
+            return await asyncio.wait_for(future, max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            self.expired += 1
+            raise
+
+    def _flush(self):
+        """Starts batches from the queue while fewer than max_in_flight are running; the rest wait for one to finish."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        loop = asyncio.get_running_loop()
+        # requests that already timed out are not worth scoring
+        live = [entry for entry in self.queue if not entry[3].done() and entry[2] > loop.time()]
+        self.pending -= len(self.queue) - len(live)
+        self.queue = live
+        while self.queue and self.in_flight < self.max_in_flight:
+            batch, self.queue = self.queue[:self.max_batch], self.queue[self.max_batch:]
+            self.in_flight += 1
+            task = loop.create_task(self._score(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _score_live(self, batch, k, now):
+        """Executor job: (entries still waiting, their records). Entries that expired or were cancelled
+        while the batch was queued in the executor are skipped here rather than scored."""
+        live = [entry for entry in batch if not entry[3].done() and entry[2] > now()]
+        return live, recommend_block(self.engine, [entry[0] for entry in live], k, self.min_score) if live else []
+
+    async def _score(self, batch):
+        loop = asyncio.get_running_loop()
+        k = max(entry[1] for entry in batch)
+        try:
+            live, records = await loop.run_in_executor(self.executor, self._score_live, batch, k, loop.time)
+        except Exception as e:
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.in_flight -= 1
+            self.pending -= len(batch)
+            if self.queue:
+                self._flush()
+        if live:
+            self.batches += 1
+            self.batched += len(live)
+        for (_, entry_k, _, future), record in zip(live, records):
+            if future.done():
+                continue
+            if 'results' in record:
+                # top-K is best first, so a smaller k is a prefix of the batch's largest
+                record['results'] = record['results'][:entry_k]
+            future.set_result(record)
+
+    def stats(self):
+        return {'pending': self.pending, 'in_flight': self.in_flight, 'batches': self.batches, 'requests_batched': self.batched,
+                'mean_batch': self.batched / self.batches if self.batches else 0.0,
+                'rejected': self.rejected, 'expired': self.expired}
+
+
+class RecommendationService:
+    def __init__(self, batcher, default_timeout=DEFAULT_TIMEOUT):
+        self.batcher = batcher
+        self.default_timeout = default_timeout
+
+    async def route(self, method, path, body):
+        """(status, payload, extra headers) for one request."""
+        path = path.split('?', 1)[0]
+        if path == '/healthz':
+            if method != 'GET':
+                return 405, {'error': 'use GET'}, {'Allow': 'GET'}
+            return 200, {'status': 'ok', **self.batcher.stats()}, {}
+        if path != '/recommend':
+            return 404, {'error': 'not found'}, {}
+        if method != 'POST':
+            return 405, {'error': 'use POST'}, {'Allow': 'POST'}
+
+        try:
+            raw = json.loads(body or b'{}')
+            profile = normalize_profile(raw, None)
+            k = TOP_K if raw.get('k') is None else raw['k']
+            if isinstance(k, bool) or not isinstance(k, (int, str)):
+                raise ValueError('k must be an integer')
+            k = max(1, min(int(k), MAX_K))
+            timeout = min(float(raw['timeout_ms']) / 1000, MAX_TIMEOUT) if raw.get('timeout_ms') else self.default_timeout
+        except (ValueError, TypeError) as e:
+            return 400, {'error': str(e)}, {}
+
+        try:
+            record = await self.batcher.recommend(profile, k, asyncio.get_running_loop().time() + timeout)
+        except Overloaded:
+            return 503, {'error': 'overloaded, retry shortly'}, {'Retry-After': '1'}
+        except asyncio.TimeoutError:
+            return 504, {'error': 'deadline exceeded'}, {}
+        if 'error' in record:
+            return 400, record, {}
+        return 200, record, {}
+
+    async def handle(self, reader, writer):
+        """Serves HTTP/1.1 requests on one connection, keeping it open unless asked not to."""
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    await self.respond(writer, 400, {'error': 'malformed request'}, {}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {'error': 'request body too large'}, {}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                try:
+                    status, payload, extra = await self.route(method, path, body)
+                except Exception as e:
+                    status, payload, extra = 500, {'error': f'{type(e).__name__}: {e}'}, {}
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await self.respond(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer, status, payload, extra, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = {'Content-Type': 'application/json; charset=utf-8', 'Content-Length': str(len(body)),
+                   'Connection': 'keep-alive' if keep_alive else 'close', **extra}
+        head = f"HTTP/1.1 {status} {REASONS[status]}\r\n" + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode('latin-1') + b"\r\n" + body)
+        await writer.drain()
+
+
+async def serve(host, port, engine, workers=2, default_timeout=DEFAULT_TIMEOUT, **batcher_options):
+    """Runs the service until cancelled."""
+    with ThreadPoolExecutor(workers, thread_name_prefix='score') as executor:
+        # one batch per scoring thread: more would only wait inside the executor, past the batcher's deadline checks
+        batcher = MicroBatcher(engine, executor, max_in_flight=workers, **batcher_options)
+        service = RecommendationService(batcher, default_timeout)
+        server = await asyncio.start_server(service.handle, host, port)
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Serving recommendations on {addresses}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m recommender.service', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=2, help="scoring threads (default 2)")
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH, help=f"requests per batch (default {MAX_BATCH})")
+    parser.add_argument('--batch-wait-ms', type=float, default=BATCH_WAIT * 1000,
+                        help=f"how long a batch waits to fill (default {BATCH_WAIT * 1000:g})")
+    parser.add_argument('--max-pending', type=int, default=MAX_PENDING,
+                        help=f"admitted requests before answering 503 (default {MAX_PENDING})")
+    parser.add_argument('--timeout-ms', type=float, default=DEFAULT_TIMEOUT * 1000,
+                        help=f"deadline for requests without timeout_ms (default {DEFAULT_TIMEOUT * 1000:g})")
+    args = parser.parse_args(argv)
+
+    engine = Recommender.builtin()
+    engine.index  # fit or map the index before the first request
+    try:
+        asyncio.run(serve(args.host, args.port, engine, args.workers, args.timeout_ms / 1000, max_batch=args.max_batch,
+                          max_wait=args.batch_wait_ms / 1000, max_pending=args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""Sharded exact search: one query scored over row shards of the inverted index in parallel.
+
+    python -m recommender.sharded --size 1000000 --shards 1 2 4 8 16
+    python -m recommender.sharded --size 1000000 --shards 16 --executor process
+
+Shards are row ranges of the catalog. Postings are sorted by row within each term, so a
+shard finds its part of every query term's posting list with a binary search and no shard
+holds a copy of the index. Each worker adds its postings into a dense score array for its
+rows (no sort), applies its slice of the filter mask and keeps its own top k; the per-shard
+lists, already best first, are merged into the global top k. Results equal exact search.
+
+Threads (the default) share the index in place; the per-shard work is numpy on arrays of
+postings. With executor='process', workers memory-map the stored index (recommender.store)
+and are sent only the query terms and their slice of the mask. The CLI reports latency for
+each shard count, so the automatic choice can be checked on the serving hosts.
+"""
+import argparse
+import heapq
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from . import store
+from .ranking import search_postings, top_k
+
+MIN_SHARD_ROWS = 100_000   # smaller shards cost more in dispatch than they save in scoring
+EXECUTORS = ('thread', 'process')
+
+
+def default_shards(rows, cores=None):
+    """One shard per core, but none smaller than MIN_SHARD_ROWS listings."""
+    cores = cores or os.cpu_count() or 1
+    return max(1, min(cores, rows // MIN_SHARD_ROWS))
+
+
+def search_shard(inverted, start, end, terms, weights, mask, k, min_score):
+    """Top k (rows, scores) among rows [start, end) of `inverted`; `mask` covers those rows only."""
+    indptr, indices, data = inverted.indptr, inverted.indices, inverted.data
+    shard_rows, shard_weights = [], []
+    for term, weight in zip(terms, weights):
+        column_start, column_end = indptr[term], indptr[term + 1]
+        low, high = np.searchsorted(indices[column_start:column_end], [start, end]) + column_start
+        shard_rows.append(indices[low:high])
+        shard_weights.append(data[low:high] * weight)
+    if not shard_rows:
+        return np.array([], dtype=int), np.array([])
+    scores = np.bincount(np.concatenate(shard_rows) - start, weights=np.concatenate(shard_weights), minlength=end - start)
+    keep = np.flatnonzero(mask & (scores > min_score))
+    best = keep[top_k(scores[keep], k)]
+    return best + start, scores[best]
+
+
+def merge_top_k(results, k):
+    """The k best of per-shard (rows, scores) lists, each best first; ties keep shard order."""
+    merged = list(islice(heapq.merge(*(zip(scores.tolist(), rows.tolist()) for rows, scores in results),
+                                     key=lambda hit: -hit[0]), k))
+    return np.array([row for _, row in merged], dtype=int), np.array([score for score, _ in merged])
+
+
+_worker_inverted = None
+
+
+def _init_worker(key):
+    global _worker_inverted
+    _worker_inverted = store.load(key)['matrices']['inverted_index']
+
+
+def _search_in_worker(start, end, terms, weights, mask, k, min_score):
+    return search_shard(_worker_inverted, start, end, terms, weights, mask, k, min_score)
+
+
+class ShardedSearch:
+    """Parallel exact search over a TfidfIndex's inverted index; `store_key` is needed for processes."""
+
+    def __init__(self, inverted, shards=None, executor='thread', store_key=None):
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}")
+        rows = inverted.shape[0]
+        self.inverted = inverted
+        self.shards = max(1, min(shards or default_shards(rows), rows))
+        self.bounds = np.linspace(0, rows, self.shards + 1).astype(int).tolist()
+        self.executor = executor
+        if self.shards == 1:
+            self.pool = None
+        elif executor == 'thread':
+            self.pool = ThreadPoolExecutor(self.shards, thread_name_prefix='shard')
+        else:
+            if store_key is None:
+                raise ValueError("executor='process' needs the store key of the index")
+            # spawn: forking a threaded server (Streamlit, the HTTP service) is unsafe
+            self.pool = ProcessPoolExecutor(self.shards, mp_context=multiprocessing.get_context('spawn'),
+                                            initializer=_init_worker, initargs=(store_key,))
+
+    def search(self, query_vector, mask, k, min_score):
+        """Top k (rows, scores) among the listings in `mask`, as TfidfIndex.search returns them."""
+        terms, weights = query_vector.indices.tolist(), query_vector.data.tolist()
+        shards = list(zip(self.bounds[:-1], self.bounds[1:]))
+        if self.pool is None:
+            return search_shard(self.inverted, 0, self.bounds[-1], terms, weights, mask, k, min_score)
+        if self.executor == 'thread':
+            futures = [self.pool.submit(search_shard, self.inverted, start, end, terms, weights, mask[start:end], k, min_score)
+                       for start, end in shards]
+        else:
+            futures = [self.pool.submit(_search_in_worker, start, end, terms, weights, mask[start:end], k, min_score)
+                       for start, end in shards]
+        return merge_top_k([future.result() for future in futures], k)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m recommender.sharded', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=1000000, help="synthetic listings; 0 uses the built-in catalog")
+    parser.add_argument('--shards', type=int, nargs='+', default=[0], help="shard counts to report; 0 picks automatically")
+    parser.add_argument('--executor', choices=EXECUTORS, default='thread')
+    parser.add_argument('-k', '--top-k', type=int, default=50)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from .catalog import load_catalog
+    from .synthetic import generate_listings, sample_queries
+    from .tfidf import TfidfIndex
+
+    catalog = load_catalog(generate_listings(args.size, args.seed) if args.size else None)
+    index = TfidfIndex.build(catalog)
+    everything = np.ones(len(catalog), dtype=bool)
+    queries = [index.transform(text) for text in sample_queries(args.queries, args.seed)]
+    exact, exact_seconds = [], []
+    for query_vector in queries:
+        start = time.perf_counter()
+        exact.append(search_postings(index.inverted_index, query_vector, everything, args.top_k, 0.0))
+        exact_seconds.append(time.perf_counter() - start)
+
+    print(f"{len(catalog):,} listings, {os.cpu_count()} cores, auto shards {default_shards(len(catalog))}", file=sys.stderr)
+    for shards in args.shards:
+        sharded = ShardedSearch(index.inverted_index, shards or None, args.executor, f"index-{catalog.attrs['version']}")
+        sharded.search(queries[0], everything, args.top_k, 0.0)   # start the workers before timing
+        seconds, mismatches = [], 0
+        for query_vector, (rows, scores) in zip(queries, exact):
+            start = time.perf_counter()
+            sharded_rows, sharded_scores = sharded.search(query_vector, everything, args.top_k, 0.0)
+            seconds.append(time.perf_counter() - start)
+            mismatches += len(sharded_scores) != len(scores) or not np.allclose(sharded_scores, scores)
+        sharded.close()
+        print(json.dumps({
+            'shards': sharded.shards, 'executor': args.executor, 'mismatches': int(mismatches),
+            'p50_ms': float(np.percentile(seconds, 50) * 1000), 'p99_ms': float(np.percentile(seconds, 99) * 1000),
+            'exact_p50_ms': float(np.percentile(exact_seconds, 50) * 1000),
+            'exact_p99_ms': float(np.percentile(exact_seconds, 99) * 1000),
+        }))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,385 @@
+"""SQLite catalog backend: filters and a full-text prefilter pushed down, TF-IDF re-rank of the survivors.
+
+    python -m recommender.sqlcatalog catalog.db                   # the built-in listings
+    python -m recommender.sqlcatalog catalog.db --size 1000000    # synthetic listings
+    python -m recommender.sqlcatalog catalog.db --csv listings.csv
+
+Listings live in one SQLite file with indexed work-mode, city and numeric stipend columns
+and an FTS5 table over skills + description. A query asks the database for the listings
+that pass the sidebar filters and share a term with the query, best BM25 first, capped at
+CANDIDATES; only those rows are read and re-ranked with the same TF-IDF cosine as
+recommender.tfidf (same analyzer, smoothed IDF and L2 norm). Each listing's analyzed terms,
+document frequencies and TF-IDF norms are computed when the database is built, so a query
+tokenises nothing but itself and no per-listing state is held in memory: the catalog can
+be larger than RAM. Query latency follows the number of full-text matches, not catalog size.
+
+Set INTERNMATE_CATALOG_DB to the database path to serve the app from it.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from . import store
+from .cache import ResultCache
+from .catalog import BUILTIN_LISTINGS, parse_catalog
+from .engine import MIN_SCORE, RESULT_CACHE_BYTES, TOP_K, WORK_MODES
+from .memo import NO_MEMO
+from .neighbours import NEIGHBOURS
+from .ranking import top_k
+from .resume import build_skill_matcher
+from .tracing import NO_TRACE
+
+SCHEMA_VERSION = 1
+CANDIDATES = 1000      # prefiltered listings re-ranked per query; the rest of the FTS matches are never read
+CHUNK_ROWS = 50000     # listings parsed, inserted and normed per transaction while building
+LISTING_COLUMNS = ['company', 'role', 'location', 'stipend', 'description', 'skills', 'image_url']
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE listings (
+    id INTEGER PRIMARY KEY,
+    company TEXT, role TEXT, location TEXT, stipend TEXT, description TEXT, skills TEXT, image_url TEXT,
+    stipend_numeric INTEGER NOT NULL, city TEXT, work_mode TEXT NOT NULL,
+    tokens TEXT NOT NULL, norm REAL NOT NULL
+);
+CREATE TABLE terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID;
+CREATE VIRTUAL TABLE listings_fts USING fts5(tokens, content='listings', content_rowid='id');
+"""
+INDEXES = """
+CREATE INDEX listings_stipend ON listings (stipend_numeric);
+CREATE INDEX listings_city ON listings (city, stipend_numeric);
+CREATE INDEX listings_mode ON listings (work_mode, stipend_numeric);
+"""
+
+_analyzer = None
+
+
+def analyzer():
+    """The TfidfVectorizer analyzer, so database scores equal the in-memory index's."""
+    global _analyzer
+    if _analyzer is None:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        _analyzer = TfidfVectorizer().build_analyzer()
+    return _analyzer
+
+
+def listing_text(skills, description):
+    """The indexed text of a listing, as recommender.tfidf combines it."""
+    return f"{skills} {description}"
+
+
+def idf(rows, doc_freq):
+    """Smoothed IDF, the TfidfVectorizer formula."""
+    return np.log((1 + rows) / (1 + doc_freq)) + 1
+
+
+def build_database(path, chunks, version):
+    """Writes the listings in `chunks` (raw listing DataFrames) to a new database at `path`.
+
+    Two passes, both in CHUNK_ROWS transactions: insert rows with their analyzed terms while
+    counting document frequencies, then store each listing's TF-IDF norm. The file is built
+    next to `path` and renamed into place, so readers never see a half-built catalog.
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    db = sqlite3.connect(tmp)
+    try:
+        db.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+        doc_freq, rows = Counter(), 0
+        for chunk in chunks:
+            chunk = parse_catalog(chunk.reset_index(drop=True))
+            tokens = [" ".join(analyzer()(listing_text(skills, description)))
+                      for skills, description in zip(chunk['skills'].tolist(), chunk['description'].tolist())]
+            records = zip(range(rows, rows + len(chunk)), *(chunk[column].tolist() for column in LISTING_COLUMNS),
+                          chunk['stipend_numeric'].tolist(), chunk['city'].astype(object).where(chunk['city'].notna(), None).tolist(),
+                          chunk['work_mode'].astype(str).tolist(), tokens)
+            with db:
+                db.executemany(f"INSERT INTO listings VALUES ({', '.join('?' * 12)}, 0)", records)
+            present = CountVectorizer(analyzer=str.split, binary=True)
+            chunk_counts = present.fit_transform(tokens)
+            doc_freq.update(dict(zip(present.get_feature_names_out().tolist(), np.bincount(chunk_counts.indices).tolist())))
+            rows += len(chunk)
+
+        with db:
+            db.executemany("INSERT INTO terms VALUES (?, ?)", doc_freq.items())
+        vocabulary = {term: column for column, term in enumerate(doc_freq)}
+        term_idf = idf(rows, np.fromiter(doc_freq.values(), dtype=float, count=len(doc_freq)))
+        for start in range(0, rows, CHUNK_ROWS):
+            ids, tokens = zip(*db.execute("SELECT id, tokens FROM listings WHERE id >= ? AND id < ?",
+                                          (start, start + CHUNK_ROWS)))
+            weighted = CountVectorizer(analyzer=str.split, vocabulary=vocabulary).transform(tokens).multiply(term_idf).tocsr()
+            norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+            with db:
+                db.executemany("UPDATE listings SET norm = ? WHERE id = ?", zip(norms.tolist(), ids))
+
+        with db:
+            db.executescript(INDEXES + "INSERT INTO listings_fts(listings_fts) VALUES ('rebuild');")
+            db.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ('schema', str(SCHEMA_VERSION)), ('version', version), ('rows', str(rows))])
+        db.execute("ANALYZE")
+    finally:
+        db.close()
+    os.replace(tmp, path)
+    return path
+
+
+def listing_chunks(listings, chunk_rows=CHUNK_ROWS):
+    """Raw listing DataFrames of at most chunk_rows rows from a {column: values} dict."""
+    import pandas as pd
+
+    rows = len(listings['company'])
+    for start in range(0, rows, chunk_rows):
+        yield pd.DataFrame({column: listings[column][start:start + chunk_rows] for column in LISTING_COLUMNS})
+
+
+def _file_identity(path):
+    stat = os.stat(path)
+    return stat.st_dev, stat.st_ino
+
+
+class _Connection:
+    """A read-only connection to one catalog file, with the catalog state read through it.
+
+    build_database() swaps a new file in with os.replace, giving the path a new inode while
+    this connection keeps reading the file it opened, so `identity` (the opened file's device
+    and inode) tells whether the path still names the same catalog.
+    """
+
+    def __init__(self, path):
+        while True:
+            identity = _file_identity(path)
+            db = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+            meta = dict(db.execute("SELECT key, value FROM meta"))
+            if _file_identity(path) == identity:
+                break
+            db.close()   # replaced while opening: the meta may come from either file
+        if int(meta.get('schema', 0)) != SCHEMA_VERSION:
+            db.close()
+            raise ValueError(f"{path} was built with a different catalog schema; rebuild it")
+        self.db, self.identity = db, identity
+        self.version, self.rows = meta['version'], int(meta['rows'])
+        self.cities = [city for city, in db.execute(
+            "SELECT DISTINCT city FROM listings WHERE city IS NOT NULL ORDER BY city")]
+
+    def execute(self, sql, params=()):
+        return self.db.execute(sql, params)
+
+
+class SqliteRecommender:
+    """The Recommender interface over a catalog database built by build_database().
+
+    Row ids are the listings' ids, which follow insertion order, so they equal the rows the
+    in-memory Recommender returns for the same listings. Each thread reads through its own
+    read-only connection; the result cache is shared like Recommender's.
+
+    A rebuilt database replacing the file is picked up without a restart: a thread whose
+    connection is to the old file reopens it on its next call. Each call works through one
+    connection, so its version (which keys the caches), IDF row count and listings all come
+    from the same file.
+    """
+
+    def __init__(self, path, result_cache_bytes=RESULT_CACHE_BYTES, candidates=CANDIDATES):
+        self.path = Path(path)
+        self.candidates = candidates
+        self._local = threading.local()
+        self._connection()   # fails fast on a missing file or another schema
+        self.result_cache = ResultCache(result_cache_bytes)
+        self._skill_matcher = None   # (version, matcher)
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        """This thread's connection, reopened when the file at `path` has been replaced."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or _file_identity(self.path) != connection.identity:
+            if connection is not None:
+                connection.db.close()
+            connection = self._local.connection = _Connection(self.path)
+        return connection
+
+    @property
+    def version(self):
+        return self._connection().version
+
+    @property
+    def rows(self):
+        return self._connection().rows
+
+    @property
+    def cities(self):
+        return self._connection().cities
+
+    @property
+    def skill_matcher(self):
+        connection = self._connection()
+        matcher = self._skill_matcher
+        if matcher is None or matcher[0] != connection.version:
+            with self._lock:
+                if self._skill_matcher is None or self._skill_matcher[0] != connection.version:
+                    skills = [skills for skills, in connection.execute("SELECT DISTINCT skills FROM listings")]
+                    self._skill_matcher = (connection.version, build_skill_matcher(skills))
+                matcher = self._skill_matcher
+        return matcher[1]
+
+    @staticmethod
+    def _where(work_mode, location, min_stipend):
+        """SQL conditions and parameters for the sidebar filters, with the same meaning as Recommender.mask."""
+        if work_mode not in WORK_MODES:
+            raise ValueError(f"work_mode must be one of {', '.join(WORK_MODES)}")
+        conditions, params = ["l.stipend_numeric >= ?"], [min_stipend]
+        if work_mode == 'Online':
+            conditions.append("l.work_mode = 'Remote'")
+        elif work_mode == 'Offline':
+            conditions.append("l.work_mode != 'Remote'")
+        if location is not None:
+            conditions.append("l.city = ?")
+            params.append(location)
+        return " AND ".join(conditions), params
+
+    def has_listings(self, work_mode='Any', location=None, min_stipend=0):
+        where, params = self._where(work_mode, location, min_stipend)
+        return self._connection().execute(f"SELECT EXISTS (SELECT 1 FROM listings l WHERE {where})", params).fetchone()[0] == 1
+
+    def listings(self, rows):
+        """Listing columns for `rows`, in that order, as a DataFrame positioned 0..len(rows)-1."""
+        import pandas as pd
+
+        rows = [int(row) for row in rows]
+        if not rows:
+            return pd.DataFrame(columns=LISTING_COLUMNS)
+        found = {record[0]: record[1:] for record in self._connection().execute(
+            f"SELECT id, {', '.join(LISTING_COLUMNS)} FROM listings WHERE id IN ({', '.join('?' * len(rows))})", rows)}
+        return pd.DataFrame([found[row] for row in rows], columns=LISTING_COLUMNS)
+
+    def similar(self, row, k=NEIGHBOURS):
+        """The listings most like `row`, as (rows, scores), best first.
+
+        There is no precomputed graph here: the listing's own analyzed terms are the query, so
+        each call costs one candidate query instead of a lookup.
+        """
+        connection = self._connection()
+        found = connection.execute("SELECT tokens FROM listings WHERE id = ?", [int(row)]).fetchone()
+        if found is None:
+            return np.array([], dtype=int), np.array([])
+        rows, scores = self._recommend(connection, found[0], k=k + 1)
+        other = rows != row
+        return rows[other][:k], scores[other][:k]
+
+    def query_terms(self, query, connection=None):
+        """(terms, idf, L2-normalised query weights) over the query terms the catalog contains."""
+        connection = connection or self._connection()
+        counts = Counter(analyzer()(query))
+        doc_freq = dict(connection.execute(
+            f"SELECT term, df FROM terms WHERE term IN ({', '.join('?' * len(counts))})", list(counts))) if counts else {}
+        terms = sorted(doc_freq)
+        term_idf = idf(connection.rows, np.array([doc_freq[term] for term in terms], dtype=float))
+        weights = np.array([counts[term] for term in terms]) * term_idf
+        return terms, term_idf, weights / (np.linalg.norm(weights) or 1)
+
+    def recommend(self, query='', work_mode='Any', location=None, min_stipend=0, k=TOP_K, min_score=MIN_SCORE,
+                  trace=NO_TRACE, memo=NO_MEMO):
+        """Top k listing ids for the query and filters, as (rows, scores); see Recommender.recommend.
+
+        Filters are applied inside the candidate query, so with a `memo` a filter change reuses
+        only the analyzed query terms; an unchanged request reuses the ranking.
+        """
+        return self._recommend(self._connection(), query, work_mode, location, min_stipend, k, min_score, trace, memo)
+
+    def _recommend(self, connection, query='', work_mode='Any', location=None, min_stipend=0, k=TOP_K,
+                   min_score=MIN_SCORE, trace=NO_TRACE, memo=NO_MEMO):
+        version = connection.version
+        where, params = self._where(work_mode, location, min_stipend)
+        filters = (version, work_mode, location, min_stipend)
+        if not query:
+            def stipend_rank():
+                with trace.span('sql_stipend_rank'):
+                    rows = [row for row, in connection.execute(
+                        f"SELECT l.id FROM listings l WHERE {where} ORDER BY l.stipend_numeric DESC, l.id LIMIT ?", params + [k])]
+                return np.array(rows, dtype=int), None
+            return memo.get('ranking', (filters, None, k), stipend_rank)
+
+        with trace.span('query_terms'):
+            terms, term_idf, weights = memo.get('query_terms', (version, query), lambda: self.query_terms(query, connection))
+        if not terms:
+            return np.array([], dtype=int), np.array([])
+
+        def rank():
+            with trace.span('result_cache'):
+                key = (tuple(sorted(analyzer()(query))), work_mode, location, min_stipend, k, min_score, self.candidates)
+                cached = self.result_cache.get(version, key)
+            if cached is not None:
+                return cached
+            with trace.span('sql_candidates'):
+                # each term is a quoted FTS phrase, so FTS tokenisation never matches less than the analyzer
+                match = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+                candidates = connection.execute(
+                    f"SELECT l.id, l.tokens, l.norm FROM listings_fts f JOIN listings l ON l.id = f.rowid "
+                    f"WHERE listings_fts MATCH ? AND {where} ORDER BY f.rank LIMIT ?",
+                    [match] + params + [self.candidates]).fetchall()
+            with trace.span('tfidf_rerank'):
+                rows, scores = self._rerank(candidates, terms, term_idf * weights)
+                keep = scores > min_score
+                rows, scores = rows[keep], scores[keep]
+                best = top_k(scores, k)
+                rows, scores = rows[best], scores[best]
+            self.result_cache.put(version, key, rows, scores)
+            return rows, scores
+        return memo.get('ranking', (filters, query, k, min_score), rank)
+
+    @staticmethod
+    def _rerank(candidates, terms, term_weights):
+        """Exact TF-IDF cosine of each candidate: query-term counts x (IDF x query weight) over the stored norm."""
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        if not candidates:
+            return np.array([], dtype=int), np.array([])
+        rows, tokens, norms = zip(*candidates)
+        counts = CountVectorizer(analyzer=str.split, vocabulary=terms).transform(tokens)
+        norms = np.asarray(norms)
+        scores = (counts @ term_weights) / np.where(norms > 0, norms, 1)
+        # ties in id order, as the in-memory search returns them
+        order = np.argsort(rows, kind='stable')
+        return np.asarray(rows, dtype=int)[order], np.asarray(scores)[order]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m recommender.sqlcatalog', description=__doc__.split('\n\n')[0])
+    parser.add_argument('path', help="database file to create (replaced if it exists)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--size', type=int, default=0, help="synthetic listings; 0 (default) uses the built-in catalog")
+    source.add_argument('--csv', help=f"CSV with columns {', '.join(LISTING_COLUMNS)}, read in chunks")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.csv:
+        import pandas as pd
+
+        with open(args.csv, 'rb') as source_file:
+            version = hashlib.file_digest(source_file, 'sha256').hexdigest()
+        chunks = pd.read_csv(args.csv, usecols=LISTING_COLUMNS, dtype=str, keep_default_na=False, chunksize=CHUNK_ROWS)
+    else:
+        from .synthetic import generate_listings
+
+        listings = generate_listings(args.size, args.seed) if args.size else BUILTIN_LISTINGS
+        version = store.content_hash(json.dumps(listings, sort_keys=True, ensure_ascii=False))
+        chunks = listing_chunks(listings)
+    build_database(args.path, chunks, version)
+    engine = SqliteRecommender(args.path)
+    print(f"{engine.rows:,} listings written to {args.path} in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
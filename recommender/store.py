@@ -0,0 +1,136 @@
+"""Versioned on-disk store for catalogs and their sparse search matrices.
+
+Each entry is a directory named after the store format and a content key. Sparse matrix
+buffers, numeric columns and categorical codes are plain .npy files opened with
+mmap_mode='r'; the matrices stay mapped, so every Streamlit process on the same host shares
+the same page-cache pages instead of rebuilding and holding a private copy. Text columns
+are stored as one NUL-separated UTF-8 file each and decoded with a single split.
+"""
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+STORE_FORMAT = 1
+STORE_DIR = Path(os.environ.get('INTERNMATE_INDEX_DIR', Path(__file__).resolve().parent.parent / '.index_cache'))
+
+
+def content_hash(*parts):
+    """sha256 over bytes/str parts; used as the catalog version in entry keys."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8') if isinstance(part, str) else bytes(part))
+    return digest.hexdigest()
+
+
+def entry_path(key):
+    return STORE_DIR / f"v{STORE_FORMAT}-{key}"
+
+
+def _write_text(path, values):
+    path.write_text('\0'.join(values), encoding='utf-8')
+
+
+def _read_text(path, rows):
+    return path.read_text(encoding='utf-8').split('\0') if rows else []
+
+
+def save(key, frame=None, matrices=None, arrays=None, texts=None, meta=None):
+    """Writes an entry atomically: built in a temp dir, then renamed into place.
+
+    A concurrent writer that loses the rename race simply discards its copy.
+    """
+    import pandas as pd
+
+    final = entry_path(key)
+    if final.exists():
+        return final
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = STORE_DIR / f".tmp-{key}-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    manifest = {'format': STORE_FORMAT, 'key': key, 'meta': meta or {}, 'columns': [], 'matrices': {},
+                'arrays': sorted(arrays or {}), 'texts': {}}
+
+    if frame is not None:
+        manifest['rows'] = len(frame)
+        for name, column in frame.items():
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                np.save(tmp / f"col.{name}.codes.npy", column.cat.codes.to_numpy())
+                manifest['columns'].append({'name': name, 'kind': 'category', 'categories': column.cat.categories.tolist()})
+            elif pd.api.types.is_numeric_dtype(column.dtype) or pd.api.types.is_bool_dtype(column.dtype):
+                np.save(tmp / f"col.{name}.npy", column.to_numpy())
+                manifest['columns'].append({'name': name, 'kind': 'array'})
+            else:
+                _write_text(tmp / f"col.{name}.txt", column.fillna('').astype(str).tolist())
+                manifest['columns'].append({'name': name, 'kind': 'text'})
+
+    for name, matrix in (matrices or {}).items():
+        fmt = 'csc' if matrix.format == 'csc' else 'csr'
+        matrix = matrix.asformat(fmt)
+        if not matrix.has_sorted_indices:
+            matrix = matrix.sorted_indices()
+        for part in ('data', 'indices', 'indptr'):
+            np.save(tmp / f"mat.{name}.{part}.npy", getattr(matrix, part))
+        manifest['matrices'][name] = {'format': fmt, 'shape': list(matrix.shape)}
+
+    for name, array in (arrays or {}).items():
+        np.save(tmp / f"arr.{name}.npy", np.asarray(array))
+
+    for name, values in (texts or {}).items():
+        _write_text(tmp / f"txt.{name}.txt", values)
+        manifest['texts'][name] = len(values)
+
+    (tmp / 'manifest.json').write_text(json.dumps(manifest), encoding='utf-8')
+    try:
+        os.rename(tmp, final)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return final
+
+
+def load(key):
+    """Opens an entry with memory-mapped arrays; returns None when it is missing or from another format."""
+    path = entry_path(key)
+    try:
+        manifest = json.loads((path / 'manifest.json').read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format') != STORE_FORMAT:
+        return None
+    import pandas as pd
+
+    frame = None
+    if 'rows' in manifest:
+        rows, columns = manifest['rows'], {}
+        for column in manifest['columns']:
+            name = column['name']
+            if column['kind'] == 'category':
+                codes = np.load(path / f"col.{name}.codes.npy", mmap_mode='r')
+                columns[name] = pd.Categorical.from_codes(codes, categories=column['categories'])
+            elif column['kind'] == 'array':
+                columns[name] = np.load(path / f"col.{name}.npy", mmap_mode='r')
+            else:
+                columns[name] = _read_text(path / f"col.{name}.txt", rows)
+        # copy=False keeps the mapped, read-only arrays as the frame's columns: no private copy per
+        # process, and an in-place write raises instead of silently diverging from the stored catalog
+        frame = pd.DataFrame(columns, index=pd.RangeIndex(rows), copy=False)
+
+    matrices = {}
+    if manifest['matrices']:
+        import scipy.sparse as sp   # not needed to open catalogs, which are frames only
+    for name, spec in manifest['matrices'].items():
+        buffers = [np.load(path / f"mat.{name}.{part}.npy", mmap_mode='r') for part in ('data', 'indices', 'indptr')]
+        cls = sp.csc_matrix if spec['format'] == 'csc' else sp.csr_matrix
+        matrices[name] = cls(tuple(buffers), shape=tuple(spec['shape']), copy=False)
+
+    return {
+        'frame': frame,
+        'matrices': matrices,
+        'arrays': {name: np.load(path / f"arr.{name}.npy", mmap_mode='r') for name in manifest['arrays']},
+        'texts': {name: _read_text(path / f"txt.{name}.txt", count) for name, count in manifest['texts'].items()},
+        'meta': manifest['meta'],
+    }
@@ -0,0 +1,104 @@
+"""Synthetic internship listings at any size, shaped like BUILTIN_LISTINGS, for benchmarks and load tests."""
+import numpy as np
+
+# domain: (roles, skills, tasks); a listing draws its role, 3-5 skills and a task from one domain
+DOMAINS = {
+    'Software': (
+        ['Software Engineer Intern', 'Backend Developer Intern', 'Full Stack Intern', 'Mobile Developer Intern'],
+        ['Python', 'Java', 'JavaScript', 'TypeScript', 'React', 'Node.js', 'Git', 'SQL', 'Django', 'Flutter', 'REST APIs'],
+        ['Developing web applications', 'Building backend services', 'Shipping features for our mobile app',
+         'Writing APIs and automated tests'],
+    ),
+    'Frontend': (
+        ['Frontend Developer Intern', 'UI Engineer Intern'],
+        ['React', 'JavaScript', 'HTML', 'CSS', 'Tailwind', 'TypeScript', 'Figma', 'Accessibility'],
+        ['Building responsive user interfaces', 'Turning designs into reusable components'],
+    ),
+    'Data': (
+        ['Data Analyst Intern', 'Business Analyst Intern', 'Data Engineer Intern', 'Healthcare Data Intern'],
+        ['Python', 'Pandas', 'SQL', 'Excel', 'Power BI', 'Tableau', 'Statistics', 'Data Cleaning', 'Visualization', 'Spark'],
+        ['Analyzing large datasets', 'Creating dashboards and data visualizations', 'Building data pipelines',
+         'Cleaning and modelling operational data'],
+    ),
+    'ML': (
+        ['Machine Learning Intern', 'AI Research Intern', 'Computer Vision Intern', 'NLP Intern'],
+        ['Python', 'TensorFlow', 'PyTorch', 'Scikit-learn', 'NLP', 'Computer Vision', 'Deep Learning', 'Statistics'],
+        ['Building and training machine learning models', 'Evaluating models on real-world data',
+         'Researching deep learning approaches'],
+    ),
+    'Cloud': (
+        ['Cloud Computing Intern', 'DevOps Intern', 'Site Reliability Intern'],
+        ['AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Linux', 'Terraform', 'CI/CD', 'Bash'],
+        ['Working on cloud infrastructure and deployment pipelines', 'Automating infrastructure and monitoring'],
+    ),
+    'Design': (
+        ['UI/UX Design Intern', 'Graphic Design Intern', 'Product Design Intern'],
+        ['Figma', 'Sketch', 'UI/UX', 'Prototyping', 'Adobe XD', 'Illustrator', 'User Research', 'Wireframing'],
+        ['Designing user interfaces and wireframes for mobile apps', 'Running user research and usability tests'],
+    ),
+    'Marketing': (
+        ['Digital Marketing Intern', 'Content Marketing Intern', 'Social Media Intern', 'Growth Intern'],
+        ['SEO', 'SEM', 'Social Media', 'Content Creation', 'Copywriting', 'Google Analytics', 'Email Marketing'],
+        ['Managing social media campaigns and creating content', 'Planning growth experiments and campaigns'],
+    ),
+    'Finance': (
+        ['Financial Analyst Intern', 'Risk Analyst Intern', 'Investment Banking Intern', 'Accounting Intern'],
+        ['Excel', 'Financial Modeling', 'Data Analysis', 'Risk Analysis', 'Accounting', 'Valuation', 'Python', 'R'],
+        ['Assisting with financial modeling and market analysis', 'Analyzing financial risks and building predictive models'],
+    ),
+    'Product': (
+        ['Product Management Intern', 'PM Intern', 'Product Analyst Intern'],
+        ['Product Management', 'Market Research', 'Agile', 'JIRA', 'Scrum', 'Product Strategy', 'SQL', 'Roadmapping'],
+        ['Assisting with product roadmaps and feature ideation', 'Supporting product strategy and launches'],
+    ),
+    'Gaming': (
+        ['Game Developer Intern', 'Game Designer Intern', '3D Artist Intern'],
+        ['Unity', 'C#', 'Unreal Engine', 'C++', 'Game Design', '3D Modeling', 'Blender'],
+        ['Developing game mechanics and level design', 'Prototyping gameplay systems'],
+    ),
+}
+CITIES = ['Mumbai', 'Delhi', 'Bangalore', 'Pune', 'Hyderabad', 'Chennai', 'Kolkata', 'Ahmedabad', 'Jaipur',
+          'Noida', 'Gurugram', 'Kochi', 'Indore', 'Chandigarh', 'Lucknow', 'Nagpur']
+MODES = ['On-site', 'Hybrid']
+COMPANY_PREFIXES = ['Tech', 'Data', 'Cloud', 'Quantum', 'Bright', 'Future', 'Green', 'Blue', 'Nova', 'Pixel',
+                    'Smart', 'Prime', 'Fin', 'Health', 'Edu', 'Agri', 'Swift', 'Core', 'Next', 'Vista']
+COMPANY_SUFFIXES = ['Labs', 'Innovations', 'Solutions', 'Works', 'Systems', 'Analytics', 'Studios', 'Ventures',
+                    'Technologies', 'Networks']
+COMPANY_FORMS = ['Inc.', 'Ltd.', 'Pvt. Ltd.', 'Co.', 'LLP']
+REMOTE_SHARE = 0.25
+
+
+def generate_listings(n, seed=0):
+    """{column: values} for `n` listings in the BUILTIN_LISTINGS format; the same seed gives the same listings."""
+    rng = np.random.default_rng(seed)
+    names = list(DOMAINS)
+    domain_ids = rng.integers(len(names), size=n)
+    picks = rng.integers(1 << 30, size=(n, 12))
+    skill_counts = rng.integers(3, 6, size=n)
+    remote = rng.random(n) < REMOTE_SHARE
+    stipends = rng.integers(5, 51, size=n) * 1000
+
+    listings = {key: [] for key in ('company', 'role', 'location', 'stipend', 'description', 'skills', 'image_url')}
+    for domain_id, pick, skill_count, is_remote, stipend in zip(
+            domain_ids.tolist(), picks.tolist(), skill_counts.tolist(), remote.tolist(), stipends.tolist()):
+        domain = names[domain_id]
+        roles, skills, tasks = DOMAINS[domain]
+        chosen = list(dict.fromkeys(skills[p % len(skills)] for p in pick[3:3 + skill_count]))
+        listings['company'].append(
+            f"{COMPANY_PREFIXES[pick[0] % 20]} {COMPANY_SUFFIXES[pick[1] % 10]} {COMPANY_FORMS[pick[2] % 5]}")
+        listings['role'].append(roles[pick[8] % len(roles)])
+        listings['location'].append('Remote' if is_remote else f"{CITIES[pick[10] % len(CITIES)]} ({MODES[pick[11] % 2]})")
+        listings['stipend'].append(f"₹{stipend:,}")
+        listings['description'].append(
+            f"{tasks[pick[9] % len(tasks)]} using {chosen[0]} and {chosen[-1]}." if len(chosen) > 1
+            else f"{tasks[pick[9] % len(tasks)]} using {chosen[0]}.")
+        listings['skills'].append(", ".join(chosen))
+        listings['image_url'].append(f"https://placehold.co/400x150/007bff/ffffff?text={domain}")
+    return listings
+
+
+def sample_queries(count, seed=0):
+    """Skill queries of one to three skills, the way students type them."""
+    rng = np.random.default_rng(seed)
+    skills = sorted({skill for _, domain_skills, _ in DOMAINS.values() for skill in domain_skills})
+    return [", ".join(rng.choice(skills, size=rng.integers(1, 4), replace=False).tolist()) for _ in range(count)]
@@ -0,0 +1,59 @@
+"""Fit-once TF-IDF index over a catalog version, persisted in the on-disk store."""
+from . import store
+from .ranking import search_postings
+
+
+class TfidfIndex:
+    """TF-IDF over each listing's skills + description, searched through its inverted index.
+
+    Fitted once per catalog version; later processes memory-map the stored matrices and
+    rebuild the vectorizer from the saved vocabulary and IDF instead of refitting.
+    """
+
+    def __init__(self, vectorizer, catalog_vectors, inverted_index):
+        self.vectorizer = vectorizer
+        self.catalog_vectors = catalog_vectors
+        # Column-major copy doubles as an inverted index: term -> (listing ids, weights)
+        self.inverted_index = inverted_index
+        self._analyzer = vectorizer.build_analyzer()
+
+    @classmethod
+    def build(cls, catalog):
+        """Loads the stored index for `catalog.attrs['version']`, or fits and stores it."""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        key = f"index-{catalog.attrs['version']}"
+        stored = store.load(key)
+        if stored is None:
+            combined_text = catalog['skills'] + " " + catalog['description']
+            vectorizer = TfidfVectorizer().fit(combined_text)
+            catalog_vectors = vectorizer.transform(combined_text)
+            store.save(
+                key,
+                matrices={'catalog_vectors': catalog_vectors, 'inverted_index': catalog_vectors.tocsc()},
+                arrays={'idf': vectorizer.idf_},
+                texts={'vocabulary': vectorizer.get_feature_names_out().tolist()},
+            )
+            # reopen mapped: the matrices are then read-only and shared by every process on the host
+            stored = store.load(key)
+
+        vectorizer = TfidfVectorizer()
+        vectorizer.vocabulary_ = {term: column for column, term in enumerate(stored['texts']['vocabulary'])}
+        vectorizer.idf_ = stored['arrays']['idf']
+        return cls(vectorizer, stored['matrices']['catalog_vectors'], stored['matrices']['inverted_index'])
+
+    def terms(self, text):
+        """The analyzed terms of `text`, order-free as TF-IDF sees them; a stable cache key for the query."""
+        return tuple(sorted(self._analyzer(text)))
+
+    def transform(self, text):
+        return self.vectorizer.transform([text])
+
+    def score_block(self, texts):
+        """Similarity of every text to every listing as one sparse (texts x listings) CSR product."""
+        # the transposed inverted index is CSR over terms, so this is a CSR x CSR product
+        return self.vectorizer.transform(texts) @ self.inverted_index.T
+
+    def search(self, text, mask, k, min_score):
+        """Top k (rows, scores) among the listings in `mask`; only the query vector is computed per call."""
+        return search_postings(self.inverted_index, self.transform(text), mask, k, min_score)
@@ -0,0 +1,130 @@
+"""Lightweight wall-clock tracing for script reruns and requests.
+
+A Trace records top-level stages with lap() (each lap ends where the previous one did) and
+nested work with span(). When tracing is off, start_trace() returns NO_TRACE, whose methods
+do nothing, so instrumented code pays one attribute lookup and call per stage.
+Finished traces are appended to a JSON-lines file, one object per run.
+
+The first run of an app in each process is its cold start: claim_startup() picks that run
+and record_startup() keeps its trace, with the process age and the heavy modules loaded,
+as the startup profile of the replica.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+HEAVY_MODULES = ('pandas', 'scipy', 'sklearn', 'pypdf')   # imports worth keeping off the first paint
+
+_write_lock = threading.Lock()
+_startup = {}   # app name -> startup record (None until recorded), once per process
+_startup_lock = threading.Lock()
+
+
+def write_record(path, record):
+    """Appends one JSON object as a line of the file at `path`."""
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _write_lock, open(path, 'a', encoding='utf-8') as trace_file:
+        trace_file.write(line)
+
+
+class Trace:
+    enabled = True
+
+    def __init__(self, name, start=None, **fields):
+        self.name = name
+        self.fields = fields
+        self.spans = []   # (name, depth, start seconds from trace start, duration seconds)
+        # `start` (a perf_counter() value) backdates the trace, e.g. to before the script's imports
+        self.start = self._last_lap = time.perf_counter() if start is None else start
+        self.started_at = time.time() - (time.perf_counter() - self.start)
+        self._depth = 0
+
+    def lap(self, name):
+        """Closes the top-level stage that began at the previous lap (or at the start of the trace)."""
+        now = time.perf_counter()
+        self.spans.append((name, 0, self._last_lap - self.start, now - self._last_lap))
+        self._last_lap = now
+
+    @contextmanager
+    def span(self, name):
+        """Times the enclosed block as a stage nested inside the current lap."""
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, self._depth, start - self.start, time.perf_counter() - start))
+            self._depth -= 1
+
+    def record(self):
+        """The trace as a JSON-serialisable dict, spans in start order."""
+        return {
+            'trace': self.name, 'ts': self.started_at, 'total_ms': (time.perf_counter() - self.start) * 1000,
+            **self.fields,
+            'spans': [{'name': name, 'depth': depth, 'start_ms': start * 1000, 'ms': duration * 1000}
+                      for name, depth, start, duration in sorted(self.spans, key=lambda span: (span[2], span[1]))],
+        }
+
+    def write(self, path):
+        """Appends the record to the JSON-lines file at `path`."""
+        write_record(path, self.record())
+
+
+class _NoTrace:
+    enabled = False
+    _span = nullcontext()
+
+    def lap(self, name):
+        pass
+
+    def span(self, name):
+        return self._span
+
+
+NO_TRACE = _NoTrace()
+
+
+def start_trace(name, enabled, start=None, **fields):
+    """A recording Trace when `enabled`, else the shared no-op NO_TRACE."""
+    return Trace(name, start, **fields) if enabled else NO_TRACE
+
+
+def process_age():
+    """Seconds since this process started, from /proc; None where that is unavailable."""
+    try:
+        with open('/proc/self/stat', encoding='ascii') as stat, open('/proc/uptime', encoding='ascii') as uptime:
+            started_ticks = int(stat.read().rsplit(')', 1)[1].split()[19])
+            return float(uptime.read().split()[0]) - started_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def heavy_modules():
+    """The HEAVY_MODULES imported so far in this process."""
+    return [module for module in HEAVY_MODULES if module in sys.modules]
+
+
+def claim_startup(name):
+    """True for the first run of app `name` in this process only; that run is the one to profile."""
+    with _startup_lock:
+        if name in _startup:
+            return False
+        _startup[name] = None
+        return True
+
+
+def record_startup(name, trace, **fields):
+    """Keeps and returns the startup profile: the cold run's trace record, process age and heavy modules loaded."""
+    age = process_age()
+    record = {**trace.record(), 'startup': True, 'process_age_ms': None if age is None else age * 1000,
+              'heavy_modules': heavy_modules(), **fields}
+    _startup[name] = record
+    return record
+
+
+def startup_record(name):
+    """The startup profile of app `name` in this process, or None before its first run has finished."""
+    return _startup.get(name)
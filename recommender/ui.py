@@ -0,0 +1,233 @@
+"""Static assets of the InternMate app: the language tables and the page CSS.
+
+They live in a module so each is built once per process rather than on every script rerun;
+the CSS is also minified once, which shrinks the style element sent on each rerun.
+"""
+import re
+
+
+def minify_css(css):
+    """Drops comments and the whitespace CSS does not need."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{}:;,>])\s*", r"\1", css).replace(";}", "}").strip()
+
+
+LANGUAGE_OPTIONS = {'English': 'en', 'हिंदी': 'hi', 'मराठी': 'mr', 'தமிழ்': 'ta'}
+
+# --- Language Strings (Includes all multilingual text) ---
+TEXT_STRINGS = {
+    "en": {
+        "page_title": "InternMate", "header_title": "InternMate 💼",
+        "header_tagline": "Find your next big opportunity with InternMate—a personalized search experience.",
+        "sidebar_title": "🔍 Search and Filter", "sidebar_tagline": "Use the filters below to get personalized recommendations.",
+        "select_language": "🌐 Select Language", "select_location": "📍 Preferred Location",
+        "work_mode": "💻 Select Work Mode", "online": "Online", "offline": "Offline", "any": "Any",
+        "enter_skills": "✏️ Enter your skills (e.g., Python, AI, Web Development)",
+        "min_stipend": "💰 Minimum stipend (₹)", "show_recommendations": "✨ Show Recommendations",
+        "recommendations_title": "🎯 Your Internship Recommendations", "stipend_label": "Stipend",
+        "upload_cv": "📄 Upload CV/Resume (PDF or TXT)",
+        "no_results": "😔 No internships found matching your criteria. Try broadening your search!", "help_title": "📚 Help and Support Centre",
+        "faq_1_q": "How does the recommendation engine work?", "faq_1_a": "Our recommendation engine uses a combination of natural language processing (NLP) and machine learning algorithms. It uses **Cosine Similarity** to find the most relevant matches based on your skills.",
+        "faq_2_q": "How do I filter for internships?", "faq_2_a": "You can use the sidebar to filter internships by **Work Mode**, **Location**, **Skills**, and **Minimum Stipend**.",
+        "faq_3_q": "Can I upload my resume for personalized recommendations?", "faq_3_a": "Yes, upload your resume (PDF or TXT) in the sidebar. Skills found in it are added to the skills you type, and both are used for matching.",
+        "faq_4_q": "What is the difference between 'Online' and 'Offline' work modes?", "faq_4_a": "Selecting **'Online'** shows Remote internships. **'Offline'** shows On-site or Hybrid internships.",
+        "faq_5_q": "How is the stipend calculated?", "faq_5_a": "The stipend displayed for each internship is a fixed amount specified in the dataset. The **'Minimum stipend'** slider filters for internships that meet or exceed this amount.",
+        "footer": "InternMate - Made by Girkar Namira Siddique",
+        "previous_page": "◀ Previous", "next_page": "Next ▶", "page_status": "Page {page} of {pages}",
+        "more_like_this": "🔁 More like {role}", "similar_title": "🔁 Internships like {role}", "back_to_results": "◀ Back to recommendations",
+        "cv_skills": "Skills found in your CV", "cv_no_skills": "No known skills were found in this CV.", "cv_too_large": "This CV is too large to read (max 5 MB)."
+    },
+    "hi": {
+        "page_title": "इंटरनमैट", "header_title": "इंटरनमैट 💼",
+        "header_tagline": "इंटरनमैट के साथ अपना अगला बड़ा अवसर खोजें—एक व्यक्तिगत खोज अनुभव।",
+        "sidebar_title": "🔍 खोजें और फ़िल्टर करें", "sidebar_tagline": "व्यक्तिगत सिफारिशों के लिए नीचे दिए गए फ़िल्टर का उपयोग करें।",
+        "select_language": "🌐 भाषा चुनें", "select_location": "📍 पसंदीदा स्थान",
+        "work_mode": "💻 कार्य मोड चुनें", "online": "ऑनलाइन", "offline": "ऑफ़लाइन", "any": "कोई भी",
+        "enter_skills": "✏️ अपने कौशल दर्ज करें (उदा. Python, AI, Web Development)",
+        "min_stipend": "💰 न्यूनतम वजीफा (₹)", "show_recommendations": "✨ सिफारिशें दिखाएं",
+        "recommendations_title": "🎯 आपकी इंटर्नशिप सिफारिशें", "stipend_label": "वजीफा",
+        "upload_cv": "📄 बायोडाटा / रिज्यूमे अपलोड करें (PDF या TXT)",
+        "no_results": "😔 आपके मानदंडों से मेल खाने वाली कोई इंटर्नशिप नहीं मिली। अपनी खोज का विस्तार करें!", "help_title": "📚 सहायता और समर्थन केंद्र",
+        "faq_1_q": "सिफारिश इंजन कैसे काम करता है?", "faq_1_a": "हमारा सिफारिश इंजन प्राकृतिक भाषा प्रसंस्करण (NLP) और मशीन लर्निंग एल्गोरिदम के संयोजन का उपयोग करता है। यह सबसे प्रासंगिक मिलान खोजने के लिए **Cosine Similarity** नामक तकनीक का उपयोग करता है।",
+        "faq_2_q": "मैं इंटर्नशिप कैसे फ़िल्टर करूँ?", "faq_2_a": "आप **कार्य मोड**, **स्थान**, **कौशल**, और **न्यूनतम वजीफा** द्वारा इंटर्नशिप को फ़िल्टर करने के लिए साइडबार का उपयोग कर सकते हैं।",
+        "faq_3_q": "क्या मैं व्यक्तिगत सिफारिशों के लिए अपना बायोडाटा अपलोड कर सकता हूँ?", "faq_3_a": "हाँ, साइडबार में अपना बायोडाटा (PDF या TXT) अपलोड करें। इसमें मिले कौशल आपके द्वारा दर्ज किए गए कौशल में जोड़े जाते हैं और दोनों का उपयोग मिलान के लिए किया जाता है।",
+        "faq_4_q": "'ऑनलाइन' और 'ऑफ़लाइन' कार्य मोड में क्या अंतर है?", "faq_4_a": "**'ऑनलाइन'** चुनने पर रिमोट इंटर्नशिप दिखाई देगी। **'ऑफ़लाइन'** चुनने पर ऑन-साइट या हाइब्रिड इंटर्नशिप दिखाई देगी।",
+        "faq_5_q": "वजीफा की गणना कैसे की जाती है?", "faq_5_a": "प्रत्येक इंटर्नशिप के लिए प्रदर्शित वजीफा डेटासेट में निर्दिष्ट एक निश्चित राशि है। **'न्यूनतम वजीफा'** स्लाइडर केवल उन इंटर्नशिप को फ़िल्टर करता है जो आपके द्वारा चुनी गई राशि के बराबर या उससे अधिक हैं।",
+        "footer": "InternMate - Girkar Namira Siddique द्वारा बनाया गया",
+        "previous_page": "◀ पिछला", "next_page": "अगला ▶", "page_status": "पृष्ठ {page} / {pages}",
+        "more_like_this": "🔁 {role} जैसी और", "similar_title": "🔁 {role} जैसी इंटर्नशिप", "back_to_results": "◀ सिफारिशों पर वापस जाएँ",
+        "cv_skills": "आपके बायोडाटा में मिले कौशल", "cv_no_skills": "इस बायोडाटा में कोई ज्ञात कौशल नहीं मिला।", "cv_too_large": "यह बायोडाटा पढ़ने के लिए बहुत बड़ा है (अधिकतम 5 MB)।"
+    },
+    "mr": {
+        "page_title": "इंटरनमैट", "header_title": "इंटरनमैट 💼",
+        "header_tagline": "InternMate सह तुमची पुढील मोठी संधी शोधा—एक वैयक्तिक शोध अनुभव.",
+        "sidebar_title": "🔍 शोधा आणि फिल्टर करा", "sidebar_tagline": "वैयक्तिक शिफारसी मिळवण्यासाठी खालील फिल्टर वापरा.",
+        "select_language": "🌐 भाषा निवडा", "select_location": "📍 पसंतीचे स्थान",
+        "work_mode": "💻 कार्य मोड निवडा", "online": "ऑनलाइन", "offline": "ऑफलाइन", "any": "कोणतेही",
+        "enter_skills": "✏️ तुमची कौशल्ये टाका (उदा. Python, AI, Web Development)",
+        "min_stipend": "💰 किमान स्टायपेंड (₹)", "show_recommendations": "✨ शिफारसी दाखवा",
+        "recommendations_title": "🎯 तुमच्या इंटर्नशिप शिफारसी", "stipend_label": "स्टायपेंड",
+        "upload_cv": "📄 बायोडाटा / रिझ्युमे अपलोड करा (PDF किंवा TXT)",
+        "no_results": "😔 तुमच्या निकषांशी जुळणारी कोणतीही इंटर्नशिप सापडली नाही। कृपया तुमचा शोध विस्तृत करा!", "help_title": "📚 मदत आणि समर्थन केंद्र",
+        "faq_1_q": "शिफारस इंजिन कसे कार्य करते?", "faq_1_a": "आमचे शिफारस इंजिन नैसर्गिक भाषा प्रक्रिया (NLP) आणि मशीन लर्निंग अल्गोरिदमचे संयोजन वापरते। सर्वात संबंधित जुळणी शोधण्यासाठी ते **Cosine Similarity** नावाचे तंत्र वापरते।",
+        "faq_2_q": "मी इंटर्नशिप कशी फिल्टर करू?", "faq_2_a": "तुम्ही **कार्य मोड**, **स्थान**, **कौशल्ये**, आणि **किमान स्टायपेंड** नुसार इंटर्नशिप फिल्टर करण्यासाठी साइडबार वापरू शकता।",
+        "faq_3_q": "मी वैयक्तिक शिफारसींसाठी माझा बायोडाटा अपलोड करू शकतो का?", "faq_3_a": "होय, साइडबारमध्ये तुमचा बायोडाटा (PDF किंवा TXT) अपलोड करा. त्यात सापडलेली कौशल्ये तुम्ही टाकलेल्या कौशल्यांमध्ये जोडली जातात आणि दोन्ही जुळणीसाठी वापरली जातात.",
+        "faq_4_q": "'ऑनलाइन' आणि 'ऑफलाइन' कार्य मोडमध्ये काय फरक आहे?", "faq_4_a": "**'ऑनलाइन'** निवडल्यास रिमोट इंटर्नशिप दिसतील. **'ऑफलाइन'** निवडल्यास ऑन-साइट किंवा हाइब्रिड इंटर्नशिप दिसतील।",
+        "faq_5_q": "स्टायपेंडची गणना कशी केली जाते?", "faq_5_a": "प्रत्येक इंटर्नशिपसाठी दर्शविलेला स्टायपेंड डेटासेटमध्ये निर्दिष्ट केलेली एक निश्चित रक्कम आहे। **'किमान स्टायपेंड'** स्लाइडर तुम्ही निवडलेल्या रकमेच्या बरोबरीच्या किंवा त्याहून अधिक इंटर्नशिप फिल्टर करतो।",
+        "footer": "InternMate - Girkar Namira Siddique यांनी तयार केले आहे",
+        "previous_page": "◀ मागील", "next_page": "पुढील ▶", "page_status": "पृष्ठ {page} / {pages}",
+        "more_like_this": "🔁 {role} सारख्या आणखी", "similar_title": "🔁 {role} सारख्या इंटर्नशिप", "back_to_results": "◀ शिफारसींकडे परत जा",
+        "cv_skills": "तुमच्या बायोडाटामध्ये सापडलेली कौशल्ये", "cv_no_skills": "या बायोडाटामध्ये कोणतीही ओळखीची कौशल्ये सापडली नाहीत.", "cv_too_large": "हा बायोडाटा वाचण्यासाठी खूप मोठा आहे (कमाल 5 MB)."
+    },
+    "ta": {
+        "page_title": "இன்டர்ன்மேட்", "header_title": "இன்டர்ன்மேட் 💼",
+        "header_tagline": "இன்டர்ன்மேட் உடன் உங்கள் அடுத்த பெரிய வாய்ப்பைக் கண்டறியவும் - தனிப்பயனாக்கப்பட்ட தேடல் அனுபவம்.",
+        "sidebar_title": "🔍 தேடு மற்றும் வடிகட்டு", "sidebar_tagline": "தனிப்பயனாக்கப்பட்ட பரிந்துரைகளைப் பெற கீழே உள்ள வடிப்பான்களைப் பயன்படுத்தவும்.",
+        "select_language": "🌐 மொழியைத் தேர்ந்தெடுக்கவும்", "select_location": "📍 விருப்பமான இடம்",
+        "work_mode": "💻 வேலை முறையைத் தேர்ந்தெடுக்கவும்", "online": "ஆன்லைன்", "offline": "ஆஃப்லைன்", "any": "ஏதேனும்",
+        "enter_skills": "✏️ உங்கள் திறன்களை உள்ளிடவும் (எ.கா., Python, AI, Web Development)",
+        "min_stipend": "💰 குறைந்தபட்ச உதவித்தொகை (₹)", "show_recommendations": "✨ பரிந்துரைகளைக் காட்டு",
+        "recommendations_title": "🎯 உங்கள் இன்டர்ன்ஷிப் பரிந்துரைகள்", "stipend_label": "உதவித்தொகை",
+        "upload_cv": "📄 பயோடேட்டா / ரெஸ்யூம் பதிவேற்றவும் (PDF அல்லது TXT)",
+        "no_results": "😔 உங்கள் அளவுகோல்களுடன் பொருந்தக்கூடிய இன்டர்ன்ஷிப்கள் எதுவும் கண்டறியப்படவில்லை. உங்கள் தேடலை விரிவாக்குங்கள்!", "help_title": "📚 உதவி மற்றும் ஆதரவு மையம்",
+        "faq_1_q": "பரிந்துரை இயந்திரம் எவ்வாறு செயல்படுகிறது?", "faq_1_a": "எங்கள் பரிந்துரை இயந்திரம் இயற்கை மொழி செயலாக்கம் (NLP) மற்றும் இயந்திர கற்றல் அல்காரிதம்களின் கலவையைப் பயன்படுத்துகிறது. இது மிகவும் பொருத்தமான பொருத்தங்களைக் கண்டறிய **Cosine Similarity** எனப்படும் ஒரு நுட்பத்தைப் பயன்படுத்துகிறது.",
+        "faq_2_q": "இன்டர்ன்ஷிப்களை நான் எப்படி வடிகட்டுவது?", "faq_2_a": "இன்டர்ன்ஷிப்களை **வேலை முறை**, **இடம்**, **திறன்கள்**, மற்றும் **குறைந்தபட்ச உதவித்தொகை** ஆகியவற்றின் அடிப்படையில் வடிகட்ட நீங்கள் பக்கப்பட்டியைப் பயன்படுத்தலாம்.",
+        "faq_3_q": "தனிப்பயனாக்கப்பட்ட பரிந்துரைகளுக்கு எனது பயோடேட்டாவை நான் பதிவேற்ற முடியுமா?", "faq_3_a": "ஆம், பக்கப்பட்டியில் உங்கள் பயோடேட்டாவை (PDF அல்லது TXT) பதிவேற்றவும். அதில் கண்டறியப்பட்ட திறன்கள் நீங்கள் உள்ளிடும் திறன்களுடன் சேர்க்கப்பட்டு, இரண்டும் பொருத்தத்திற்குப் பயன்படுத்தப்படும்.",
+        "faq_4_q": "'ஆன்லைன்' மற்றும் 'ஆஃப்லைன்' வேலை முறைகளுக்கு என்ன வித்தியாசம்?", "faq_4_a": "**'ஆன்லைன்'** என்பதைத் தேர்ந்தெடுப்பது, **'ரிமோட்'** இன்டர்ன்ஷிப்களை உங்களுக்குக் காண்பிக்கும். **'ஆஃப்லைன்'** என்பதைத் தேர்ந்தெடுப்பது, **'ஆன்-சைட்'** அல்லது **'ஹைப்ரிட்'** இன்டர்ன்ஷிப்களை உங்களுக்குக் காண்பிக்கும்.",
+        "faq_5_q": "உதவித்தொகை எவ்வாறு கணக்கிடப்படுகிறது?", "faq_5_a": "ஒவ்வொரு இன்டர்ன்ஷிப்பிற்கும் காட்டப்படும் உதவித்தொகை, தரவுத்தொகுப்பில் குறிப்பிடப்பட்ட ஒரு நிலையான தொகையாகும். **'குறைந்தபட்ச உதவித்தொகை'** ஸ்லைடர், நீங்கள் தேர்ந்தெடுத்த தொகைக்கு சமமான அல்லது அதற்கு அதிகமாக உள்ள இன்டர்ன்ஷிப்களை மட்டுமே வடிகட்டுகிறது।",
+        "footer": "InternMate - Girkar Namira Siddique அவர்களால் உருவாக்கப்பட்டது",
+        "previous_page": "◀ முந்தைய", "next_page": "அடுத்து ▶", "page_status": "பக்கம் {page} / {pages}",
+        "more_like_this": "🔁 {role} போன்றவை", "similar_title": "🔁 {role} போன்ற இன்டர்ன்ஷிப்கள்", "back_to_results": "◀ பரிந்துரைகளுக்குத் திரும்பு",
+        "cv_skills": "உங்கள் பயோடேட்டாவில் கண்டறியப்பட்ட திறன்கள்", "cv_no_skills": "இந்த பயோடேட்டாவில் அறியப்பட்ட திறன்கள் எதுவும் கண்டறியப்படவில்லை.", "cv_too_large": "இந்த பயோடேட்டா படிக்க மிகப் பெரியது (அதிகபட்சம் 5 MB)."
+    }
+}
+
+APP_CSS = minify_css("""
+<style>
+/* Base App Styling */
+.stApp { background-color: #f0f2f6; font-family: 'Inter', sans-serif; }
+
+/* Header Styling */
+.header { 
+    background: linear-gradient(135deg, #e0f7fa, #ffffff);
+    padding: 30px; 
+    border-radius: 12px; 
+    box-shadow: 0 8px 16px rgba(0, 0, 0, 0.1); 
+    text-align: center;
+    margin-bottom: 20px;
+}
+.header h1 { 
+    color: #007bff; 
+    font-size: 3rem; 
+    font-weight: 800; 
+    letter-spacing: 1px;
+}
+.header p { 
+    color: #555555; 
+    margin-top: 10px;
+    font-size: 1.1rem;
+}
+
+/* Sidebar button style for aesthetics */
+div[data-testid="stSidebar"] button {
+    background-color: #4CAF50;
+    color: white;
+    border-radius: 8px;
+    padding: 10px 15px;
+    font-weight: bold;
+    margin-top: 15px;
+    transition: background-color 0.3s;
+}
+div[data-testid="stSidebar"] button:hover {
+    background-color: #45a049;
+}
+
+/* Card Grid Layout */
+.card-grid { 
+    display: grid; 
+    grid-template-columns: repeat(auto-fit, minmax(350px, 1fr)); /* Slightly wider cards */
+    gap: 20px; 
+    margin-top: 20px;
+}
+.internship-card { 
+    background-color: #ffffff; 
+    padding: 0; /* Remove padding from main card to fit image */
+    overflow: hidden;
+    border-radius: 12px; 
+    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08); 
+    transition: transform 0.3s, box-shadow 0.3s; 
+    /* Dynamic border-left color set in Python */
+    border-left: 5px solid #007bff; 
+}
+.internship-card:hover { 
+    transform: translateY(-5px); 
+    box-shadow: 0 10px 20px rgba(0, 0, 0, 0.15);
+}
+
+.card-image-container {
+    height: 150px;
+    overflow: hidden;
+}
+.card-image {
+    width: 100%;
+    height: 100%;
+    object-fit: cover;
+}
+.card-content {
+    padding: 15px;
+}
+.card-header { 
+    display: flex; 
+    justify-content: space-between; 
+    align-items: flex-start; 
+    margin-bottom: 10px; 
+}
+.card-title { 
+    font-size: 1.4rem; 
+    font-weight: 700; 
+    color: #333333; 
+    flex-grow: 1;
+}
+.card-location { 
+    font-size: 0.9rem; 
+    color: #007bff; 
+    background-color: #e6f3ff;
+    padding: 4px 8px;
+    border-radius: 6px;
+    font-weight: 500;
+}
+.card-stipend { 
+    font-size: 1.1rem; 
+    color: #388e3c; /* Dark Green */
+    font-weight: bold; 
+    margin-top: 5px; 
+}
+.card-description { 
+    font-size: 0.95rem; 
+    color: #666666; 
+    margin-top: 10px;
+    line-height: 1.4;
+}
+.card-skills { 
+    display: flex; 
+    flex-wrap: wrap; 
+    gap: 8px; 
+    margin-top: 15px;
+}
+.skill-tag { 
+    background-color: #f0f0f0; 
+    color: #777777; 
+    padding: 6px 12px; 
+    border-radius: 20px; 
+    font-size: 0.8rem;
+    font-weight: 500;
+}
+
+/* Utility/Footer */
+.empty-results { text-align: center; color: #999999; margin-top: 50px; font-size: 1.2rem; }
+footer { text-align: center; margin-top: 50px; padding: 10px; font-size: 0.85rem; color: #aaaaaa; border-top: 1px solid #e0e0e0; }
+.help-section { margin-top: 30px; }
+.help-section h3 { color: #333333; font-size: 1.8rem; font-weight: bold; margin-bottom: 20px; border-bottom: 2px solid #007bff; padding-bottom: 5px;}
+</style>
+""")
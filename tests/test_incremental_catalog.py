@@ -0,0 +1,37 @@
+import pandas as pd
+
+from recommender.domains import tag_domains
+from recommender.incremental import IncrementalIndex, count_terms
+from recommender.incremental_catalog import IncrementalCatalog
+
+
+def catalog(records, columns=('company', 'role', 'location', 'stipend', 'description')):
+    frame = pd.DataFrame(records, columns=list(columns))
+    frame['domain_bits'] = tag_domains(frame['description'])
+    return IncrementalCatalog(frame, IncrementalIndex(count_terms(frame['description'])[0]), 'test')
+
+
+def live(catalog):
+    return catalog.frame[catalog.index.alive]
+
+
+def test_repost_within_one_upload_keeps_the_last():
+    base = catalog([('Acme', 'Data Intern', 'Pune', 1000, 'python sql')])
+    base.append(catalog([('Acme', 'Data Intern', 'Delhi', 2000, 'excel'),
+                         ('Beta', 'Web Intern', 'Goa', 3000, 'javascript'),
+                         ('Acme', 'Data Intern', 'Remote', 4000, 'tableau')]))
+    assert live(base)[['company', 'location', 'stipend']].values.tolist() == [['Beta', 'Goa', 3000], ['Acme', 'Remote', 4000]]
+    assert base.live == 2 and len(base.frame) == 3
+
+    rows, _, _ = base.recommend('tableau', base.mask())
+    assert base.listings(rows)['company'].tolist() == ['Acme']
+    rows, _, _ = base.recommend('excel', base.mask())
+    assert len(rows) == 0
+
+
+def test_location_keeps_its_column_position():
+    columns = ('location', 'company', 'role', 'stipend', 'description')
+    base = catalog([('Pune', 'Acme', 'Data Intern', 1000, 'python')], columns)
+    base.append(catalog([('Goa', 'Beta', 'Web Intern', 2000, 'javascript')], columns))
+    assert base.frame.columns.tolist() == [*columns, 'domain_bits']
+    assert base.frame['location'].tolist() == ['Pune', 'Goa']
@@ -0,0 +1,78 @@
+import io
+import tracemalloc
+
+import pytest
+
+from recommender.ingest import ingest_csv
+
+HEADER = "company,role,location,stipend,description\n"
+
+
+def rows(prefix, count):
+    return "".join(f"{prefix}{i},Intern,Remote,{1000 + i},python sql {i}\n" for i in range(count))
+
+
+def varied_rows(count):
+    """Rows whose descriptions hash to many terms, so the counts weigh as much as the frame."""
+    return "".join(f"C{i},Intern {i % 50},City {i % 30},{1000 + i}," + " ".join(f"term{(i * 7 + j) % 5003}" for j in range(30)) + "\n"
+                   for i in range(count))
+
+
+def ingest(text, chunk_rows=4):
+    catalog, counts, _, rejected = ingest_csv(io.BytesIO(text.encode('utf-8')), chunk_rows=chunk_rows)
+    assert counts.shape[0] == len(catalog)
+    return catalog, rejected
+
+
+def test_unterminated_quote_keeps_accepted_chunks():
+    catalog, rejected = ingest(HEADER + rows('A', 6) + 'X,"Intern,Remote,5,never closed\n' + rows('B', 6))
+    assert catalog['company'].tolist() == ['A0', 'A1', 'A2', 'A3']
+    assert len(catalog) + rejected == 13
+
+
+def test_stray_quote_rejects_the_rows_it_swallowed():
+    text = HEADER + rows('A', 3) + 'Y,Intern,Remote,5,"opens here\n' + rows('B', 4) + 'Z,Intern,Remote,1,closes"\n' + rows('C', 3)
+    catalog, rejected = ingest(text)
+    assert not catalog['company'].isin(['Y', 'Z']).any()
+    assert set(catalog['company']) == {'A0', 'A1', 'A2', 'C0', 'C1', 'C2'}
+    assert rejected == 6
+
+
+def test_quote_the_parser_drops_silently_is_counted():
+    text = HEADER + 'Q,"Intern,Remote,5,opens here\n' + rows('B', 4) + 'W,Intern,Remote,1,x"y\n' + rows('C', 3)
+    catalog, rejected = ingest(text)
+    assert set(catalog['company']) == {'C0', 'C1', 'C2'}
+    assert rejected == 6
+
+
+def test_multiline_description_is_kept():
+    catalog, rejected = ingest(HEADER + rows('A', 2) + 'M,Intern,Remote,5,"two\nlines"\n' + rows('B', 2))
+    assert rejected == 0
+    assert catalog['description'].tolist()[2] == 'two\nlines'
+
+
+def extra_peak_and_retained(count):
+    data = (HEADER + varied_rows(count)).encode('utf-8')
+    tracemalloc.start()
+    try:
+        result = ingest_csv(io.BytesIO(data), chunk_rows=1000)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - retained, retained
+
+
+def test_peak_memory_does_not_grow_with_the_catalog():
+    # string columns live in pyarrow buffers that tracemalloc does not see; pandas concatenates
+    # those without copying, so the traced numpy arrays and counts are what could double
+    ingest(HEADER + rows('W', 4))   # imports and the hasher are not part of the measurement
+    small_extra, small = extra_peak_and_retained(4000)
+    large_extra, large = extra_peak_and_retained(12000)
+    # holding every chunk until one final concatenation would add about as much as the result grows
+    assert large_extra - small_extra < 0.4 * (large - small)
+
+
+def test_missing_column_is_an_error():
+    with pytest.raises(ValueError, match='description'):
+        ingest("company,role,location,stipend\nA,Intern,Remote,5\n")
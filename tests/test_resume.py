@@ -0,0 +1,40 @@
+import io
+
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from recommender.resume import extract_resume_text
+
+
+def pdf(texts):
+    """PDF bytes with one page per text, in Helvetica."""
+    writer = PdfWriter()
+    font = DictionaryObject({NameObject('/Type'): NameObject('/Font'), NameObject('/Subtype'): NameObject('/Type1'),
+                             NameObject('/BaseFont'): NameObject('/Helvetica')})
+    for text in texts:
+        page = writer.add_blank_page(200, 200)
+        page[NameObject('/Resources')] = DictionaryObject({NameObject('/Font'): DictionaryObject({NameObject('/F1'): font})})
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 20 100 Td ({text}) Tj ET".encode('latin-1'))
+        page.replace_contents(content)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_max_pages_truncates_the_cv():
+    data = pdf([f"Page{number} Python" for number in range(5)])
+    assert extract_resume_text(data, 'pdf', max_pages=3) == 'page0 python page1 python page2 python'
+    assert extract_resume_text(data, 'pdf').split()[-2:] == ['page4', 'python']
+
+
+def test_spent_time_budget_reads_no_pages():
+    assert extract_resume_text(pdf(["SQL", "Excel"]), 'pdf', time_budget=-1) == ''
+
+
+def test_unreadable_pdf_is_empty():
+    assert extract_resume_text(b'%PDF-1.4 not really', 'pdf') == ''
+
+
+def test_text_is_normalised():
+    assert extract_resume_text('Ｐｙｔｈｏｎ,\n  SQL'.encode('utf-8'), 'txt') == 'python, sql'